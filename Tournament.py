@@ -0,0 +1,89 @@
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from tictactoe.book import get_book
+from tictactoe.players import PLAYERS, make_player, play_game
+from tictactoe.qlearning import load_q_table
+
+
+def play_games(player1, player2, games, seed, epsilon=0.1, budget=None, use_book=False):
+    # Both players are built once per chunk, so their caches and trees stay
+    # warm from one game to the next.
+    random.seed(seed)
+    q_table = None
+    if player1 in ["Reinforcement", "Quantum"] or player2 in ["Reinforcement", "Quantum"]:
+        q_table = load_q_table()
+    options = {"q_table": q_table, "epsilon": epsilon, "budget": budget, "use_book": use_book}
+    first, second = make_player(player1, **options), make_player(player2, **options)
+    results = Counter()
+    for _ in range(games):
+        results[play_game(first, second)] += 1
+    return results
+
+
+def run_tournament(player1, player2, games=1000, workers=None, seed=None, epsilon=0.1, chunk_size=25, budget=None,
+                   use_book=False):
+    for player in (player1, player2):
+        if player not in PLAYERS or player == "Human":
+            raise ValueError(f"Unknown or interactive player: {player}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if use_book:
+        # Solves and writes the book once here if it is missing, rather
+        # than in every worker.
+        get_book()
+
+    # Small fixed-size chunks keep every worker busy when game lengths vary.
+    # Chunk i always uses seed + i, so a run is reproducible for any worker count.
+    sizes = [min(chunk_size, games - start) for start in range(0, games, chunk_size)]
+
+    start = time.perf_counter()
+    results = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(play_games, player1, player2, size, seed + i, epsilon, budget, use_book)
+            for i, size in enumerate(sizes)
+        ]
+        for future in futures:
+            results.update(future.result())
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def print_results(player1, player2, results, elapsed, workers=None):
+    games = sum(results.values())
+    print(f"\nResults after {games} games:")
+    print(f"{player1} (Player 1) wins: {results['Player 1']}")
+    print(f"{player2} (Player 2) wins: {results['Player 2']}")
+    print(f"Draws: {results['Draw']}")
+    print(f"Throughput: {games / elapsed:.1f} games/s on {workers or os.cpu_count() or 1} workers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play two AI players against each other in parallel.")
+    choices = [name for name in PLAYERS if name != "Human"]
+    parser.add_argument("player1", choices=choices)
+    parser.add_argument("player2", choices=choices)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--budget-ms", type=float, default=None, help="per-move time budget for the search players")
+    parser.add_argument("--book", action="store_true", help="let the search players answer from the opening book")
+    args = parser.parse_args()
+
+    budget = None if args.budget_ms is None else args.budget_ms / 1000
+    results, elapsed = run_tournament(
+        args.player1, args.player2, args.games, args.workers, args.seed, args.epsilon, budget=budget, use_book=args.book,
+    )
+    print_results(args.player1, args.player2, results, elapsed, args.workers)
+
+
+if __name__ == "__main__":
+    main()
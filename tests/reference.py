@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+from tictactoe.board import BITS, FULL_MASK, MOVES, WINNING
+from tictactoe.geometry import STANDARD
+from tictactoe.search import win_score
+
+WIN = win_score(STANDARD)
+
+
+def carry(score):
+    return 1 - score if score > 0 else -1 - score if score < 0 else 0
+
+
+# A plain recursive negamax with the engine's depth-discounted scores, kept
+# as simple as possible to check the real search and the book against.
+@lru_cache(maxsize=None)
+def reference(x, o, x_to_move):
+    return max(reference_move(x, o, x_to_move, i) for i in MOVES[FULL_MASK ^ (x | o)])
+
+
+def reference_move(x, o, x_to_move, move):
+    if x_to_move:
+        x |= BITS[move]
+    else:
+        o |= BITS[move]
+    if WINNING[x if x_to_move else o]:
+        return WIN
+    if x | o == FULL_MASK:
+        return 0
+    return carry(reference(x, o, not x_to_move))
+
+
+def is_optimal(x, o, move):
+    x_to_move = bin(x).count("1") == bin(o).count("1")
+    return reference_move(x, o, x_to_move, move) == reference(x, o, x_to_move)
+
+
+def live_positions():
+    # Every position reachable from the empty board that is not yet decided.
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        x, o = stack.pop()
+        if (x, o) in seen:
+            continue
+        seen.add((x, o))
+        if WINNING[x] or WINNING[o] or x | o == FULL_MASK:
+            continue
+        x_to_move = bin(x).count("1") == bin(o).count("1")
+        for i in MOVES[FULL_MASK ^ (x | o)]:
+            stack.append((x | BITS[i], o) if x_to_move else (x, o | BITS[i]))
+    return sorted((x, o) for x, o in seen if not (WINNING[x] or WINNING[o] or x | o == FULL_MASK))
+
+
+LIVE = live_positions()
@@ -0,0 +1,31 @@
+from reference import LIVE, is_optimal
+
+from tictactoe.board import to_list
+from tictactoe.book import generate, get_book, load_book
+
+
+def test_book_moves_are_optimal(tmp_path):
+    book = generate(str(tmp_path / "book.bin"))
+    for x, o in LIVE:
+        assert is_optimal(x, o, book.best_move(to_list(x, o))), to_list(x, o)
+
+
+def test_book_reads_back_and_rejects_corruption(tmp_path):
+    filename = str(tmp_path / "book.bin")
+    book = generate(filename)
+    assert load_book(filename).entries == book.entries
+    with open(filename, "r+b") as f:
+        f.seek(-1, 2)
+        last = f.read(1)
+        f.seek(-1, 2)
+        f.write(bytes([last[0] ^ 1]))
+    assert load_book(filename) is None
+
+
+def test_get_book_is_cached_per_file(tmp_path):
+    first, second = str(tmp_path / "first.bin"), str(tmp_path / "second.bin")
+    book = get_book(first)
+    assert load_book(first).entries == book.entries
+    assert get_book(first) is book
+    assert get_book(second) is not book
+    assert get_book(second).entries == book.entries
@@ -0,0 +1,67 @@
+import random
+
+from tictactoe.geometry import STANDARD, Geometry, bit_cells
+from tictactoe.mcts import MCTSPlayer
+
+
+def check_tree(tree):
+    # The root has no parent or siblings, every child points back to the
+    # node it hangs from and is that node plus one stone, and every node in
+    # use is reachable from the root.
+    assert tree.parent[0] == -1 and tree.next_sibling[0] == -1
+    reached = [0]
+    for node in reached:
+        for child in tree.children(node):
+            assert tree.parent[child] == node
+            added = (tree.x[child] ^ tree.x[node]) | (tree.o[child] ^ tree.o[node])
+            assert added == 1 << tree.move[child]
+            assert tree.player[child] == tree.player[node] ^ 1
+            reached.append(child)
+    assert sorted(reached) == list(range(tree.size))
+
+
+def test_tree_is_reused_across_moves():
+    for geometry in (STANDARD, Geometry(4, 3)):
+        random.seed(7)
+        player = MCTSPlayer(iterations=300, geometry=geometry)
+        board = geometry.initialize_board()
+        tree = None
+        reused = 0
+        while True:
+            move = player.move(board)
+            board[move] = "X"
+            # The player searched on from the rerooted tree, not a new one.
+            assert tree is None or player.tree is tree
+            tree = player.tree
+            check_tree(tree)
+            assert tree.x[0] == geometry.from_list(board)[0] and tree.move[0] == move
+            if tree.winner[0] != -1 or tree.first_child[0] == -1:
+                break
+
+            # The opponent answers with a reply the tree has already expanded:
+            # its subtree, visits included, becomes the next root.
+            reply = tree.best_child()
+            board[tree.move[reply]] = "O"
+            visits, wins = tree.visits[reply], tree.wins[reply]
+            node = tree.find(*geometry.from_list(board))
+            assert node == reply
+            tree.reroot(node)
+            check_tree(tree)
+            assert (tree.visits[0], tree.wins[0]) == (visits, wins)
+            reused += 1
+            if tree.winner[0] != -1 or "=" not in board:
+                break
+        assert reused >= 2
+
+
+def test_find_misses_an_unexpanded_reply():
+    random.seed(3)
+    player = MCTSPlayer(iterations=4)
+    board = STANDARD.initialize_board()
+    board[player.move(board)] = "X"
+    tree = player.tree
+    x, o = STANDARD.from_list(board)
+    assert tree.untried[0]
+    assert tree.find(x, o | 1 << bit_cells(tree.untried[0])[0]) == -1
+    # A position that does not extend the root is not in the tree either.
+    assert tree.find(x ^ 1 << tree.move[0], o) == -1
@@ -0,0 +1,58 @@
+import numpy as np
+
+from tictactoe.qlearning import batch_update
+from tictactoe.qtable import ACTIONS, LEGAL, STATES, QTable
+
+ALPHA = 0.1
+GAMMA = 0.9
+
+
+def random_table(seed):
+    rng = np.random.default_rng(seed)
+    return QTable(rng.uniform(-1, 1, (STATES, ACTIONS)).astype(np.float32)), rng
+
+
+def one_step(values, state, action, reward, next_state):
+    if next_state < 0 or not LEGAL[next_state].any():
+        next_max = 0.0
+    else:
+        next_max = values[next_state, LEGAL[next_state]].max()
+    td = reward + GAMMA * next_max - values[state, action]
+    return values[state, action] + ALPHA * td
+
+
+def test_batch_update_matches_sequential_updates():
+    # No entry is updated twice and no next state is updated, so applying
+    # the transitions one at a time must give the same table as one batch.
+    table, rng = random_table(0)
+    states = rng.choice(STATES // 2, 500, replace=False)
+    actions = rng.integers(0, ACTIONS, 500)
+    rewards = rng.choice([-1, 0, 1], 500)
+    next_states = rng.integers(STATES // 2, STATES, 500)
+    next_states[::7] = -1
+
+    expected = table.values.copy()
+    sequential = table.values.copy()
+    for transition in zip(states, actions, rewards, next_states):
+        expected[transition[0], transition[1]] = one_step(sequential, *transition)
+        sequential[transition[0], transition[1]] = expected[transition[0], transition[1]]
+
+    batch_update(table, states, actions, rewards, next_states, ALPHA, GAMMA)
+    np.testing.assert_allclose(table.values, expected, rtol=0, atol=1e-6)
+
+
+def test_repeated_entries_move_by_their_mean_td_error():
+    table, _ = random_table(1)
+    before = table.values.copy()
+    transitions = [(10, 3, 1, -1), (10, 3, -1, -1), (10, 3, 0, 20)]
+    batch_update(table, *zip(*transitions), alpha=ALPHA, gamma=GAMMA)
+    mean_td = np.mean([(one_step(before, *t) - before[10, 3]) / ALPHA for t in transitions])
+    assert np.isclose(table.values[10, 3], before[10, 3] + ALPHA * mean_td, atol=1e-6)
+
+
+def test_full_board_next_state_scores_zero():
+    table, _ = random_table(2)
+    full = next(index for index in range(STATES) if not LEGAL[index].any())
+    before = table.values[0, 0]
+    batch_update(table, [0], [0], [0], [full], ALPHA, GAMMA)
+    assert np.isclose(table.values[0, 0], before - ALPHA * before, atol=1e-6)
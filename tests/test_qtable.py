@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from tictactoe.qtable import ACTIONS, JOURNAL_HEADER, JOURNAL_RECORD, STATES, PersistentQTable, write_atomic
+
+UPDATES = [(0, 4, 0.5), (1234, 0, -0.25), (STATES - 1, 8, 1.0)]
+
+
+class Crash(Exception):
+    pass
+
+
+def crash(records):
+    raise Crash
+
+
+@pytest.fixture
+def filename(tmp_path):
+    filename = str(tmp_path / "q_table.npy")
+    write_atomic(filename, np.zeros((STATES, ACTIONS), dtype=np.float32))
+    return filename
+
+
+def crash_before_apply(filename, updates):
+    # Leaves a complete, fsynced journal batch that never reached the map.
+    table = PersistentQTable(filename, flush_every=1 << 20)
+    for index, action, value in updates:
+        table.set(index, action, value)
+    table.apply = crash
+    with pytest.raises(Crash):
+        table.flush()
+    del table.mapped
+    return table.journal
+
+
+def test_flush_writes_through_and_empties_the_journal(filename):
+    table = PersistentQTable(filename, flush_every=1 << 20)
+    for index, action, value in UPDATES:
+        table.set(index, action, value)
+    table.close()
+    values = np.load(filename)
+    for index, action, value in UPDATES:
+        assert values[index, action] == value
+    with open(filename + ".journal", "rb") as f:
+        assert f.read() == b""
+
+
+def test_journal_is_replayed_after_a_crash(filename):
+    journal = crash_before_apply(filename, UPDATES)
+    assert not np.load(filename).any()
+
+    table = PersistentQTable(filename)
+    for index, action, value in UPDATES:
+        assert table.values[index, action] == value
+    table.close()
+    assert np.load(filename)[UPDATES[0][0], UPDATES[0][1]] == UPDATES[0][2]
+    with open(journal, "rb") as f:
+        assert f.read() == b""
+
+
+def test_short_and_corrupt_batches_are_ignored(filename):
+    journal = crash_before_apply(filename, UPDATES[:1])
+    with open(journal, "rb") as f:
+        complete = f.read()
+
+    records = np.array([(5, 5, 9.0)], dtype=JOURNAL_RECORD).tobytes()
+    corrupt = JOURNAL_HEADER.pack(1, 0) + records
+    for tail in (corrupt, corrupt[:-1], corrupt[:JOURNAL_HEADER.size - 1]):
+        with open(journal, "wb") as f:
+            f.write(complete + tail)
+        table = PersistentQTable(filename)
+        assert table.values[UPDATES[0][0], UPDATES[0][1]] == UPDATES[0][2]
+        assert table.values[5, 5] == 0
+        table.close()
+
+
+def test_a_journal_with_no_complete_batch_is_removed(filename):
+    journal = filename + ".journal"
+    with open(journal, "wb") as f:
+        f.write(JOURNAL_HEADER.pack(1, 0))
+    table = PersistentQTable(filename)
+    assert not table.values.any()
+    table.close()
+    assert not np.load(filename).any()
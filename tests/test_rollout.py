@@ -0,0 +1,100 @@
+import random
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from tictactoe import profiling
+from tictactoe.geometry import STANDARD, bit_cells, get_variant
+from tictactoe.mcts import O, X, MCTSTree, build_tree
+from tictactoe.rollout import batch_rollouts
+
+GAMES = 20000
+
+
+def exact_playouts(x, o, o_to_move, geometry=STANDARD):
+    # The result and length of the game for every order the empty cells can
+    # be filled in, which is what a uniformly random playout samples.
+    results, lengths = [], []
+    for order in permutations(bit_cells(geometry.full_mask ^ (x | o))):
+        px, po, turn = x, o, o_to_move
+        result = plies = 0
+        for cell in order:
+            plies += 1
+            if turn:
+                po |= 1 << cell
+                if geometry.wins(po, cell):
+                    result = 1
+                    break
+            else:
+                px |= 1 << cell
+                if geometry.wins(px, cell):
+                    result = -1
+                    break
+            turn = not turn
+        results.append(result)
+        lengths.append(plies)
+    return np.array(results), np.array(lengths)
+
+
+def distribution(results):
+    results = np.asarray(results)
+    return np.array([(results == 1).mean(), (results == 0).mean(), (results == -1).mean()])
+
+
+def simulated_distribution(x, o, o_to_move, geometry):
+    tree = MCTSTree(x, o, O if o_to_move else X, geometry=geometry)
+    return distribution([tree.simulate(0) for _ in range(GAMES)])
+
+
+def position(geometry, board):
+    x, o = geometry.from_list(list(board))
+    return x, o, bin(x).count("1") > bin(o).count("1")
+
+
+@pytest.mark.parametrize("board", ["=========", "X===O====", "XO==X====", "XX=XOO=O="])
+def test_batch_rollouts_sample_the_playout_distribution(board):
+    x, o, o_to_move = position(STANDARD, board)
+    results, lengths = batch_rollouts(x, o, o_to_move, GAMES, np.random.default_rng(1))
+    assert results.shape == lengths.shape == (GAMES,)
+    exact_results, exact_lengths = exact_playouts(x, o, o_to_move)
+    np.testing.assert_allclose(distribution(results), distribution(exact_results), atol=0.02)
+    assert set(lengths.tolist()) <= set(exact_lengths.tolist())
+    assert abs(lengths.mean() - exact_lengths.mean()) < 0.05
+
+
+@pytest.mark.parametrize("variant, board", [
+    ("4x4", "================"),
+    ("4x4", "XO==OX==X===O==="),
+    ("5x5k4", "============X============"),
+])
+def test_batch_rollouts_match_simulate(variant, board):
+    geometry = get_variant(variant)
+    x, o, o_to_move = position(geometry, board)
+    random.seed(2)
+    expected = simulated_distribution(x, o, o_to_move, geometry)
+    results, _ = batch_rollouts(x, o, o_to_move, GAMES, np.random.default_rng(2), geometry)
+    np.testing.assert_allclose(distribution(results), expected, atol=0.03)
+
+
+@pytest.mark.parametrize("board, o_to_move, result", [
+    # Every order the empty cells can be filled in ends the same way.
+    ("XX=XOO=O=", False, -1),
+    ("XXOX==O=O", True, 1),
+])
+def test_forced_results_are_exact(board, o_to_move, result):
+    x, o = STANDARD.from_list(list(board))
+    results, _ = batch_rollouts(x, o, o_to_move, 1000, np.random.default_rng(3))
+    assert (results == result).all()
+
+
+def test_batched_rollout_lengths_are_profiled():
+    profile = profiling.enable()
+    try:
+        random.seed(5)
+        build_tree(STANDARD.initialize_board(), 50, rollouts=8)
+    finally:
+        profiling.disable()
+    lengths = profile.histograms["rollout_lengths"]
+    assert sum(lengths.values()) == profile.counters["batched_rollouts"] == 50 * 8
+    assert set(lengths) <= set(range(10))
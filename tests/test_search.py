@@ -0,0 +1,46 @@
+import pytest
+from reference import LIVE, is_optimal, reference
+
+from tictactoe.board import to_list
+from tictactoe.geometry import STANDARD, Geometry
+from tictactoe.ordering import MoveOrdering
+from tictactoe.search import deepen, search_move
+from tictactoe.state import GameState
+from tictactoe.transposition import TranspositionTable
+
+
+def test_live_position_count():
+    assert len(LIVE) == 4520
+
+
+@pytest.mark.parametrize("prune", [True, False])
+@pytest.mark.parametrize("geometry", [STANDARD, Geometry(3, 3)], ids=["standard", "equal-copy"])
+def test_search_plays_optimally_for_both_sides(prune, geometry):
+    table = TranspositionTable(max_entries=1 << 20)
+    for x, o in LIVE:
+        move = search_move(to_list(x, o), table, geometry=geometry, prune=prune)
+        assert is_optimal(x, o, move), to_list(x, o)
+
+
+def test_pruned_and_unpruned_searches_can_share_a_table():
+    table = TranspositionTable(max_entries=1 << 20)
+    for x, o in LIVE:
+        for prune in (True, False):
+            assert is_optimal(x, o, search_move(to_list(x, o), table, prune=prune))
+
+
+def test_deepen_ends_on_the_exact_score_and_restores_the_state():
+    table = TranspositionTable(max_entries=1 << 20)
+    for x, o in LIVE:
+        state = GameState.from_masks(x, o)
+        depth, score, move = list(deepen(state, table, ordering=MoveOrdering()))[-1]
+        assert score == reference(x, o, bin(x).count("1") == bin(o).count("1"))
+        assert is_optimal(x, o, move)
+        assert state.masks == [x, o] and not state.history
+
+
+def test_deepen_restores_the_state_on_timeout():
+    state = GameState(Geometry(5, 4))
+    rounds = list(deepen(state, TranspositionTable(), deadline=0.0, ordering=MoveOrdering(state.geometry)))
+    assert rounds == [] or rounds[0][0] == 0
+    assert state.masks == [0, 0] and state.stones == 0 and not state.history
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from tictactoe.geometry import STANDARD, get_variant
+from tictactoe.state import O, X, GameState
+
+GEOMETRIES = [STANDARD, get_variant("5x5k4")]
+
+
+def snapshot(state):
+    return (list(state.counts[X]), list(state.counts[O]), list(state.masks), state.winner, state.stones, state.turn)
+
+
+@pytest.mark.parametrize("geometry", GEOMETRIES, ids=str)
+def test_undo_restores_every_field(geometry):
+    rng = random.Random(5)
+    for _ in range(200):
+        state = GameState(geometry)
+        snapshots = []
+        while not state.is_over:
+            snapshots.append(snapshot(state))
+            state.play(rng.choice(state.moves()))
+            x, o = state.masks
+            assert state.winner == (X if geometry.is_win(x) else O if geometry.is_win(o) else None)
+            assert state.stones == bin(x | o).count("1")
+        while snapshots:
+            state.undo()
+            assert snapshot(state) == snapshots.pop()
+        assert not state.history
+
+
+@pytest.mark.parametrize("geometry", GEOMETRIES, ids=str)
+def test_from_masks_matches_play(geometry):
+    rng = random.Random(6)
+    for _ in range(200):
+        state = GameState(geometry)
+        while not state.is_over:
+            state.play(rng.choice(state.moves()))
+            rebuilt = GameState.from_masks(*state.masks, geometry)
+            assert snapshot(rebuilt) == snapshot(state)
+
+
+def test_from_masks_turn():
+    assert GameState.from_masks(0, 0).turn == X
+    assert GameState.from_masks(0b1, 0).turn == O
+    assert GameState.from_masks(0b1, 0b10).turn == X
+    assert GameState.from_board(list("XO=X=====")).turn == O
@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+from tictactoe.geometry import get_variant
+from tictactoe.qlearning import load_q_table, q_table_filename
+from tictactoe.qtable import SparseQTable
+from tictactoe.training import train
+
+
+@pytest.mark.parametrize("variant, opponent", [("4x4", "self"), ("5x5k4", "random")])
+def test_variant_tables_learn(tmp_path, variant, opponent):
+    geometry = get_variant(variant)
+    filename = str(tmp_path / q_table_filename(geometry))
+    random.seed(4)
+    results, _ = train(SparseQTable(geometry), 50, opponent, checkpoint=filename)
+    assert sum(results.values()) == 50
+    q_table = load_q_table(filename, geometry)
+    assert q_table.geometry == geometry
+    assert any(row.any() for row in q_table.values.rows.values())
+
+
+def test_variant_tables_reject_batches():
+    with pytest.raises(ValueError):
+        train(SparseQTable(get_variant("4x4")), 1, batch_episodes=1)
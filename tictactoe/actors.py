@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+import queue
+import random
+import time
+from collections import Counter
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .qlearning import batch_update, save_q_table
+from .qtable import ACTIONS, STATES, QTable
+from .training import linear_schedule, make_opponent, play_episode
+
+TRANSITION = np.dtype([("state", "<u4"), ("action", "u1"), ("reward", "<f4"), ("next_state", "<i4")])
+# Record slots per actor. An actor fills a free slot with a batch of
+# transitions and the learner hands the slot back once it has applied it.
+SLOTS = 4
+# A game has at most nine moves between both sides.
+MOVES_PER_EPISODE = 9
+
+
+def _attach(name, shape, dtype):
+    memory = SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _actor(worker, workers, episodes, config, snapshot_name, records_name, free, messages):
+    opponent, agent, schedule, batch_episodes, mcts_iterations, seed = config
+    if seed is not None:
+        random.seed(seed + worker)
+    snapshot_memory, values = _attach(snapshot_name, (STATES, ACTIONS), np.float32)
+    records_memory, records = _attach(records_name, (SLOTS, batch_episodes * MOVES_PER_EPISODE), TRANSITION)
+    values.flags.writeable = False
+    snapshot = QTable(values)
+    error = None
+    try:
+        policy = make_opponent(opponent, mcts_iterations)
+        assigned = range(worker, episodes, workers)
+        for first in range(0, len(assigned), batch_episodes):
+            buffer = []
+            results = Counter()
+            for episode in assigned[first:first + batch_episodes]:
+                if opponent == "mcts":
+                    policy = make_opponent(opponent, mcts_iterations)
+                results[play_episode(snapshot, policy, agent, schedule(episode), buffer=buffer)] += 1
+            slot = free.get()
+            records[slot, :len(buffer)] = buffer
+            messages.put((worker, slot, len(buffer), results))
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        messages.put((worker, None, 0, error))
+        del snapshot, values, records
+        snapshot_memory.close()
+        records_memory.close()
+
+
+def train_parallel(q_table, episodes, opponent="self", agent="X", schedule=None, alpha=0.1, gamma=0.9,
+                   workers=None, batch_episodes=64, publish_every=1, checkpoint=None, checkpoint_every=0,
+                   log=None, mcts_iterations=200, seed=None):
+    # Actor processes play episodes against a read-only shared snapshot of
+    # the table and pass their one-step transitions back through per-actor
+    # shared-memory slots. This process is the only writer: it applies each
+    # batch with batch_update and copies the table into the snapshot every
+    # publish_every batches.
+    if schedule is None:
+        schedule = linear_schedule(1.0, 0.05, episodes)
+    workers = workers or os.cpu_count() or 1
+    capacity = batch_episodes * MOVES_PER_EPISODE
+
+    context = multiprocessing.get_context()
+    messages = context.Queue()
+    free = [context.Queue() for _ in range(workers)]
+    snapshot_memory = SharedMemory(create=True, size=q_table.values.nbytes)
+    record_memories = [SharedMemory(create=True, size=SLOTS * capacity * TRANSITION.itemsize) for _ in range(workers)]
+    snapshot = np.ndarray((STATES, ACTIONS), dtype=np.float32, buffer=snapshot_memory.buf)
+    records = [np.ndarray((SLOTS, capacity), dtype=TRANSITION, buffer=memory.buf) for memory in record_memories]
+    snapshot[:] = q_table.values
+    for slots in free:
+        for slot in range(SLOTS):
+            slots.put(slot)
+
+    config = (opponent, agent, schedule, batch_episodes, mcts_iterations, seed)
+    actors = [
+        context.Process(
+            target=_actor,
+            args=(worker, workers, episodes, config, snapshot_memory.name, record_memories[worker].name,
+                  free[worker], messages),
+            daemon=True,
+        )
+        for worker in range(workers)
+    ]
+
+    results = Counter()
+    played = batches = 0
+    next_checkpoint = checkpoint_every
+    start = time.perf_counter()
+    try:
+        for actor in actors:
+            actor.start()
+        running = workers
+        while running:
+            try:
+                worker, slot, count, payload = messages.get(timeout=1.0)
+            except queue.Empty:
+                if any(actor.exitcode not in (None, 0) for actor in actors):
+                    raise RuntimeError("an actor process exited without reporting")
+                continue
+            if slot is None:
+                if payload is not None:
+                    raise RuntimeError(f"actor {worker} failed") from payload
+                running -= 1
+                continue
+
+            batch = records[worker][slot, :count]
+            batch_update(q_table, batch["state"], batch["action"], batch["reward"], batch["next_state"], alpha, gamma)
+            del batch
+            free[worker].put(slot)
+            results.update(payload)
+            played += sum(payload.values())
+            batches += 1
+            if batches % publish_every == 0:
+                snapshot[:] = q_table.values
+
+            if checkpoint_every and played >= next_checkpoint:
+                next_checkpoint += checkpoint_every
+                if checkpoint is not None:
+                    save_q_table(q_table, checkpoint)
+                if log is not None:
+                    elapsed = time.perf_counter() - start
+                    log(f"{played} episodes, epsilon {schedule(played - 1):.3f}, "
+                        f"{played / elapsed:.0f} games/s, {dict(results)}")
+        for actor in actors:
+            actor.join()
+    finally:
+        for actor in actors:
+            if actor.is_alive():
+                actor.terminate()
+        del snapshot, records
+        for memory in [snapshot_memory, *record_memories]:
+            memory.close()
+            memory.unlink()
+
+    elapsed = time.perf_counter() - start
+    if checkpoint is not None:
+        save_q_table(q_table, checkpoint)
+    return results, elapsed
@@ -0,0 +1,176 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+from .mcts import build_tree
+from .search import alphabeta_move, minimax_move
+from .transposition import TranspositionTable
+
+# Fixed positions, one string of cells per board. Every position is still in
+# play, so each engine has a move to find.
+CORPUS = {
+    "empty": "=========",
+    "corner": "X========",
+    "center": "====X====",
+    "center-reply": "O===X====",
+    "opposite-corners": "X===O===X",
+    "threat": "XOX=O====",
+    "split": "XO==X===O",
+    "must-block": "XX=O=====",
+    "endgame": "XOXXOO=X=",
+    "last-cell": "XOX=OOOXX",
+}
+
+
+def search_engine(search):
+    # Every run starts from an empty table, so results do not depend on
+    # what ran before them.
+    def run(board):
+        table = TranspositionTable()
+        search(board, table)
+        return {"nodes": table.hits + table.misses, "cutoffs": table.cutoffs, "hits": table.hits}
+    return run
+
+
+def mcts_engine(iterations, rollouts=1):
+    def run(board):
+        tree = build_tree(board, iterations, rollouts=rollouts)
+        return {"nodes": tree.size, "rollouts": tree.rollout_count}
+    return run
+
+
+ENGINES = {
+    "minimax": search_engine(minimax_move),
+    "alphabeta": search_engine(alphabeta_move),
+    "mcts": mcts_engine(1000),
+    "mcts-batch": mcts_engine(200, rollouts=64),
+}
+
+# Metrics compared against a baseline, and whether a higher value is worse.
+COMPARED = {
+    "p50_ms": True,
+    "p95_ms": True,
+    "p99_ms": True,
+    "nodes": True,
+    "rollouts_per_second": False,
+}
+
+
+def percentile(samples, p):
+    # Nearest-rank percentile of a non-empty list.
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies, counters):
+    seconds = sum(latencies)
+    moves = len(latencies)
+    summary = {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": seconds / moves * 1000,
+        "nodes": counters.get("nodes", 0) / moves,
+    }
+    if "cutoffs" in counters:
+        summary["cutoffs"] = counters["cutoffs"] / moves
+    if "hits" in counters:
+        summary["cache_hit_rate"] = counters["hits"] / counters["nodes"] if counters["nodes"] else 0.0
+    if "rollouts" in counters:
+        summary["rollouts_per_second"] = counters["rollouts"] / seconds if seconds else 0.0
+    return summary
+
+
+def benchmark_engine(run, corpus=CORPUS, repeat=5):
+    # One untimed run first, so lazy imports and setup are not counted.
+    run(list(next(iter(corpus.values()))))
+    latencies = []
+    totals = {}
+    positions = {}
+    for name, cells in corpus.items():
+        board = list(cells)
+        samples = []
+        counters = {}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run(board[:])
+            samples.append(time.perf_counter() - start)
+            for key, value in result.items():
+                counters[key] = counters.get(key, 0) + value
+        positions[name] = summarize(samples, counters)
+        latencies.extend(samples)
+        for key, value in counters.items():
+            totals[key] = totals.get(key, 0) + value
+    summary = summarize(latencies, totals)
+    summary["positions"] = positions
+    return summary
+
+
+def run_benchmarks(engines=None, corpus=CORPUS, repeat=5):
+    engines = list(ENGINES) if engines is None else engines
+    return {
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "corpus": corpus,
+        "engines": {name: benchmark_engine(ENGINES[name], corpus, repeat) for name in engines},
+    }
+
+
+def compare(report, baseline, tolerance=0.2):
+    # Returns one line per metric that is worse than the baseline by more
+    # than tolerance (a fraction of the baseline value).
+    regressions = []
+    for engine, summary in report["engines"].items():
+        previous = baseline.get("engines", {}).get(engine)
+        if previous is None:
+            continue
+        for metric, higher_is_worse in COMPARED.items():
+            if metric not in summary or not previous.get(metric):
+                continue
+            old, new = previous[metric], summary[metric]
+            change = (new - old) / old
+            if (change if higher_is_worse else -change) > tolerance:
+                regressions.append(f"{engine} {metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'engine':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'nodes':>10}{'cutoffs':>10}{'hit rate':>10}{'rollouts/s':>12}")
+    for engine, summary in report["engines"].items():
+        print(
+            f"{engine:<12}{summary['p50_ms']:>10.3f}{summary['p95_ms']:>10.3f}{summary['p99_ms']:>10.3f}"
+            f"{summary['nodes']:>10.0f}{summary.get('cutoffs', 0):>10.0f}"
+            f"{summary.get('cache_hit_rate', 0):>10.2f}{summary.get('rollouts_per_second', 0):>12.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure move latency and search effort on a fixed set of positions.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=None)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per position")
+    parser.add_argument("--output", default=None, help="write the report as JSON")
+    parser.add_argument("--baseline", default=None, help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown as a fraction of the baseline")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.engines, repeat=args.repeat)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import math
+
+from .geometry import EMPTY, STANDARD
+
+# The 3x3 board, as named constants and functions of the standard geometry.
+BITS = STANDARD.bits
+FULL_MASK = STANDARD.full_mask
+
+# Both tables are indexed by a 9-bit mask, so a win check or a legal-move
+# listing is one lookup instead of a scan over the lines or the cells.
+WINNING = STANDARD.winning
+MOVES = tuple(tuple(i for i in range(9) if mask & BITS[i]) for mask in range(FULL_MASK + 1))
+
+from_list = STANDARD.from_list
+to_list = STANDARD.to_list
+initialize_board = STANDARD.initialize_board
+
+
+def display_board(board):
+    size = math.isqrt(len(board))
+    for row in range(0, len(board), size):
+        print(" ".join(board[row:row + size]))
+    print()
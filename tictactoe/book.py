@@ -0,0 +1,137 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from .board import BITS, FULL_MASK, WINNING, from_list
+from .search import move_scores
+from .state import O, X, GameState
+from .symmetry import canonical_index, canonicalize, from_canonical_mask
+from .transposition import TranspositionTable, position_key
+
+DEFAULT_PATH = "opening_book.bin"
+# Version 2 scores from the side to move, with quicker wins scoring higher.
+MAGIC = b"TTTBOOK2"
+HEADER = struct.Struct("<8sII")
+
+# Books already read or solved, by file name.
+_books = {}
+
+
+class Book:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, x, o, o_to_move):
+        cx, co, transform = canonicalize(x, o)
+        entry = self.entries.get(cx | co << 9 | o_to_move << 18)
+        if entry is None:
+            return None
+        value, moves = entry
+        return value, from_canonical_mask(moves, transform)
+
+    def best_move(self, board):
+        x, o = from_list(board)
+        entry = self.lookup(x, o, board.count("X") > board.count("O"))
+        if entry is None:
+            return None
+        moves = entry[1]
+        # The lowest of the optimal squares.
+        return (moves & -moves).bit_length() - 1
+
+
+def solve():
+    table = TranspositionTable(max_entries=1 << 20)
+    entries = {}
+    for o in range(FULL_MASK + 1):
+        for x in range(FULL_MASK + 1):
+            if x & o or canonical_index(x, o) != x | o << 9:
+                continue
+            if WINNING[x] or WINNING[o] or x | o == FULL_MASK:
+                continue
+            # Both sides are solved for every position, whoever would be to
+            # move in a real game.
+            state = GameState.from_masks(x, o)
+            for turn in (X, O):
+                state.turn = turn
+                scores = move_scores(state, table)
+                value = max(scores)[0]
+                moves = sum(BITS[i] for score, i in scores if score == value)
+                entries[position_key(x, o, turn)] = (value, moves)
+    return Book(entries)
+
+
+def _columns(book):
+    keys = array("I", sorted(book.entries))
+    values = array("b", (book.entries[key][0] for key in keys))
+    moves = array("H", (book.entries[key][1] for key in keys))
+    if sys.byteorder == "big":
+        keys.byteswap()
+        moves.byteswap()
+    return keys, values, moves
+
+
+def save_book(book, filename=DEFAULT_PATH):
+    payload = b"".join(column.tobytes() for column in _columns(book))
+    # Per process, since tournament workers may each write a missing book.
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(book), zlib.crc32(payload)))
+        f.write(payload)
+    os.replace(tmp, filename)
+
+
+def load_book(filename=DEFAULT_PATH):
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, count, checksum = HEADER.unpack_from(data)
+    payload = data[HEADER.size:]
+    if magic != MAGIC or len(payload) != count * 7 or zlib.crc32(payload) != checksum:
+        return None
+
+    keys, values, moves = array("I"), array("b"), array("H")
+    keys.frombytes(payload[:count * 4])
+    values.frombytes(payload[count * 4:count * 5])
+    moves.frombytes(payload[count * 5:])
+    if sys.byteorder == "big":
+        keys.byteswap()
+        moves.byteswap()
+    return Book(dict(zip(keys, zip(values, moves))))
+
+
+def get_book(filename=DEFAULT_PATH):
+    # A missing or unreadable book is solved and written on first use, which
+    # takes well under a second.
+    book = _books.get(filename)
+    if book is None:
+        book = load_book(filename)
+        if book is None:
+            try:
+                book = generate(filename)
+            except OSError:
+                book = solve()
+        _books[filename] = book
+    return book
+
+
+def generate(filename=DEFAULT_PATH):
+    book = solve()
+    save_book(book, filename)
+    if load_book(filename).entries != book.entries:
+        raise ValueError(f"Book written to {filename} does not read back identically")
+    return book
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    book = generate(path)
+    print(f"Wrote {len(book)} positions to {path} ({os.path.getsize(path)} bytes)")
@@ -0,0 +1,230 @@
+EMPTY = "="
+
+# Boards up to this many cells get a win lookup table indexed by mask, like
+# the 3x3 table in board.py.
+TABLE_CELLS = 9
+# Boards this wide only consider empty cells next to a stone, since
+# searching every empty cell of a large board is hopeless.
+LOCAL_SIZE = 7
+
+
+def bit_cells(mask):
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+def permute_mask(mask, permutation):
+    result = 0
+    while mask:
+        low = mask & -mask
+        result |= 1 << permutation[low.bit_length() - 1]
+        mask ^= low
+    return result
+
+
+class Geometry:
+    # An n x n board won by k in a row. Masks are Python ints with bit i set
+    # for cell i (row-major). lines lists every run of k cells along a row,
+    # column or diagonal, and cell_masks[i] holds the masks of just the lines
+    # through cell i, so a win test after a move looks at those and nothing
+    # else.
+    def __init__(self, size=3, k=3):
+        if not 1 <= k <= size:
+            raise ValueError(f"Cannot win {k} in a row on a {size}x{size} board")
+        self.size = size
+        self.k = k
+        self.cells = size * size
+        self.bits = tuple(1 << i for i in range(self.cells))
+        self.full_mask = (1 << self.cells) - 1
+
+        lines = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        lines.append(tuple((r + dr * j) * size + c + dc * j for j in range(k)))
+        self.lines = tuple(lines)
+        self.line_masks = tuple(sum(self.bits[i] for i in line) for line in self.lines)
+        cell_lines = [[] for _ in range(self.cells)]
+        for n, line in enumerate(self.lines):
+            for cell in line:
+                cell_lines[cell].append(n)
+        self.cell_lines = tuple(tuple(lines) for lines in cell_lines)
+        self.cell_masks = tuple(tuple(self.line_masks[n] for n in lines) for lines in self.cell_lines)
+
+        # Cells on more lines come first, then cells nearer the center: on
+        # 3x3 that is the center, the corners, then the edges.
+        center = (size - 1) / 2
+        self.order = tuple(sorted(
+            range(self.cells),
+            key=lambda i: (-len(self.cell_lines[i]), abs(i // size - center) + abs(i % size - center), i),
+        ))
+
+        self.winning = None
+        self.ordered = None
+        if self.cells <= TABLE_CELLS:
+            self.winning = tuple(
+                any(mask & line == line for line in self.line_masks) for mask in range(self.full_mask + 1)
+            )
+            # The cells of each mask in static order.
+            self.ordered = tuple(
+                tuple(i for i in self.order if mask >> i & 1) for mask in range(self.full_mask + 1)
+            )
+        self.local = size >= LOCAL_SIZE
+        # Masks of every column but the first and every column but the last,
+        # for shifting a mask sideways without wrapping between rows.
+        self.not_first = sum(self.bits[i] for i in range(self.cells) if i % size)
+        self.not_last = sum(self.bits[i] for i in range(self.cells) if i % size != size - 1)
+
+        # The eight symmetries of the square, as cell permutations.
+        n = size - 1
+        self.transforms = tuple(
+            tuple(size * r2 + c2 for r2, c2 in (mapping(r, c) for r in range(size) for c in range(size)))
+            for mapping in (
+                lambda r, c: (r, c),
+                lambda r, c: (c, n - r),
+                lambda r, c: (n - r, n - c),
+                lambda r, c: (n - c, r),
+                lambda r, c: (r, n - c),
+                lambda r, c: (n - r, c),
+                lambda r, c: (c, r),
+                lambda r, c: (n - c, n - r),
+            )
+        )
+        self.inverses = tuple(tuple(perm.index(i) for i in range(self.cells)) for perm in self.transforms)
+        self.inverse_transforms = tuple(self.transforms.index(inverse) for inverse in self.inverses)
+        # Small boards also get each transform as a table from mask to mask,
+        # and remember the canonical index of every position they meet.
+        self.mask_maps = None
+        if self.cells <= TABLE_CELLS:
+            self.mask_maps = tuple(
+                tuple(permute_mask(mask, perm) for mask in range(self.full_mask + 1)) for perm in self.transforms
+            )
+        self._canonical_indexes = {}
+
+    def __repr__(self):
+        return f"Geometry({self.size}, {self.k})"
+
+    def __eq__(self, other):
+        return isinstance(other, Geometry) and (self.size, self.k) == (other.size, other.k)
+
+    def __hash__(self):
+        return hash((self.size, self.k))
+
+    def wins(self, mask, cell):
+        # Whether mask, which has just gained cell, holds a complete line.
+        if self.winning is not None:
+            return self.winning[mask]
+        for line in self.cell_masks[cell]:
+            if mask & line == line:
+                return True
+        return False
+
+    def is_win(self, mask):
+        if self.winning is not None:
+            return self.winning[mask]
+        return any(mask & line == line for line in self.line_masks)
+
+    def neighbours(self, mask):
+        # Every cell within one step (including diagonally) of a cell in mask.
+        size = self.size
+        row = mask | (mask >> 1) & self.not_last | (mask << 1) & self.not_first
+        return (row | row >> size | row << size) & self.full_mask
+
+    def candidate_mask(self, x, o):
+        # The empty cells worth searching. On local boards that is the empty
+        # cells next to a stone, or the center cell of an empty board.
+        occupied = x | o
+        if not self.local:
+            return self.full_mask ^ occupied
+        if not occupied:
+            return self.bits[self.order[0]]
+        return self.neighbours(occupied) & ~occupied
+
+    def candidates(self, x, o):
+        # candidate_mask as a sequence of cells in static order.
+        if self.ordered is not None:
+            return self.ordered[self.full_mask ^ (x | o)]
+        mask = self.candidate_mask(x, o)
+        return [i for i in self.order if mask >> i & 1]
+
+    def from_list(self, board):
+        x = o = 0
+        for i, cell in enumerate(board):
+            if cell == "X":
+                x |= self.bits[i]
+            elif cell == "O":
+                o |= self.bits[i]
+        return x, o
+
+    def to_list(self, x, o):
+        return ["X" if x & bit else "O" if o & bit else EMPTY for bit in self.bits]
+
+    def initialize_board(self):
+        return [EMPTY] * self.cells
+
+    def canonicalize(self, x, o):
+        # The symmetric image (x, o, transform) of a position with the
+        # smallest index x | o << cells.
+        if self.mask_maps is not None:
+            images = ((mask_map[x], mask_map[o]) for mask_map in self.mask_maps)
+        else:
+            images = ((permute_mask(x, perm), permute_mask(o, perm)) for perm in self.transforms)
+        best = None
+        for transform, (cx, co) in enumerate(images):
+            index = cx | co << self.cells
+            if best is None or index < best:
+                best = index
+                result = cx, co, transform
+        return result
+
+    def canonical_index(self, x, o):
+        if self.mask_maps is None:
+            cx, co, _ = self.canonicalize(x, o)
+            return cx | co << self.cells
+        key = x | o << self.cells
+        index = self._canonical_indexes.get(key)
+        if index is None:
+            index = self._canonical_indexes[key] = min(
+                mask_map[x] | mask_map[o] << self.cells for mask_map in self.mask_maps
+            )
+        return index
+
+    def position_key(self, x, o, o_to_move):
+        # Transposition table key. On small boards symmetric positions share
+        # a key, and so an entry.
+        if self.mask_maps is None:
+            return x | o << self.cells | o_to_move << 2 * self.cells
+        return self.canonical_index(x, o) | o_to_move << 2 * self.cells
+
+
+STANDARD = Geometry(3, 3)
+
+# Named variants offered by the command-line tools, as (size, k).
+VARIANTS = {
+    "3x3": (3, 3),
+    "4x4": (4, 4),
+    "5x5k4": (5, 4),
+    "gomoku": (15, 5),
+}
+_geometries = {(3, 3): STANDARD}
+
+
+def get_geometry(size=3, k=3):
+    # One shared instance per shape, built on first use.
+    geometry = _geometries.get((size, k))
+    if geometry is None:
+        geometry = _geometries[(size, k)] = Geometry(size, k)
+    return geometry
+
+
+def get_variant(name):
+    try:
+        return get_geometry(*VARIANTS[name])
+    except KeyError:
+        raise ValueError(f"Unknown variant: {name}") from None
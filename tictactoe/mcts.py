@@ -0,0 +1,301 @@
+import math
+import random
+from array import array
+from collections import Counter
+from itertools import count
+from time import perf_counter
+
+from .geometry import STANDARD, bit_cells
+from .state import O, X
+
+profile = None
+
+
+def mask_column(cells):
+    # An array column wide enough for a mask of this many cells, or a plain
+    # list of ints for boards too large for any array type.
+    for typecode in "HIQ":
+        if array(typecode).itemsize * 8 >= cells:
+            return array(typecode)
+    return []
+
+
+class MCTSTree:
+    # Nodes live in parallel arrays indexed by node number, with children
+    # chained through first_child/next_sibling, so a node costs a few dozen
+    # bytes and the tree creates no Python objects while it grows.
+    def __init__(self, x, o, player, capacity=1024, rollouts=1, geometry=STANDARD):
+        self.geometry = geometry
+        self.capacity = 0
+        self.size = 0
+        self.x = mask_column(geometry.cells)
+        self.o = mask_column(geometry.cells)
+        self.player = array("b")
+        self.untried = mask_column(geometry.cells)
+        # The winner of a decided position: O, X, or -1 while still open.
+        self.winner = array("b")
+        self.move = array("h")
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.visits = array("i")
+        self.wins = array("d")
+        self.rollouts = rollouts
+        self.rollout_count = 0
+        self.rng = None
+        if rollouts > 1:
+            # NumPy is only needed for batched rollouts.
+            import numpy as np
+
+            self.rng = np.random.default_rng(random.getrandbits(64))
+        self.grow(capacity)
+        self.add_node(-1, -1, x, o, player)
+
+    def grow(self, capacity):
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        # Zero-filled; add_node sets every field of a node it hands out.
+        for column in self.columns():
+            if isinstance(column, list):
+                column.extend([0] * extra)
+            else:
+                column.frombytes(bytes(extra * column.itemsize))
+        self.capacity = capacity
+
+    def columns(self):
+        return (
+            self.x, self.o, self.player, self.untried, self.winner, self.move,
+            self.parent, self.first_child, self.next_sibling, self.visits, self.wins,
+        )
+
+    def add_node(self, parent, move, x, o, player):
+        if self.size == self.capacity:
+            self.grow(self.capacity * 2)
+        node = self.size
+        self.size += 1
+        self.x[node] = x
+        self.o[node] = o
+        self.player[node] = player
+        # Only the lines through the move just made can have been completed.
+        geometry = self.geometry
+        if move == -1:
+            winner = O if geometry.is_win(o) else X if geometry.is_win(x) else -1
+        elif player == X:
+            winner = O if geometry.wins(o, move) else -1
+        else:
+            winner = X if geometry.wins(x, move) else -1
+        self.winner[node] = winner
+        self.untried[node] = 0 if winner != -1 else geometry.candidate_mask(x, o)
+        self.move[node] = move
+        self.parent[node] = parent
+        self.first_child[node] = -1
+        self.visits[node] = 0
+        self.wins[node] = 0.0
+        if parent != -1:
+            self.next_sibling[node] = self.first_child[parent]
+            self.first_child[parent] = node
+        else:
+            self.next_sibling[node] = -1
+        return node
+
+    def select_child(self, node):
+        if profile is not None:
+            profile.count("uct_selections")
+        visits = self.visits
+        wins = self.wins
+        next_sibling = self.next_sibling
+        log_visits = math.log(visits[node])
+        best_child = -1
+        best_score = -float("inf")
+        child = self.first_child[node]
+        while child != -1:
+            n = visits[child]
+            score = wins[child] / n + math.sqrt(2 * log_visits / n)
+            if score > best_score:
+                best_score = score
+                best_child = child
+            child = next_sibling[child]
+        return best_child
+
+    def expand(self, node):
+        if profile is not None:
+            profile.count("expansions")
+        move = random.choice(bit_cells(self.untried[node]))
+        bit = 1 << move
+        self.untried[node] ^= bit
+        x, o = self.x[node], self.o[node]
+        if self.player[node] == O:
+            return self.add_node(node, move, x, o | bit, X)
+        return self.add_node(node, move, x | bit, o, O)
+
+    def simulate(self, node):
+        # A uniformly random playout fills the empty cells in a random order,
+        # so one shuffle replaces a random choice at every ply.
+        self.rollout_count += 1
+        winner = self.winner[node]
+        plies = 0
+        if winner != -1:
+            result = 1 if winner == O else -1
+        else:
+            x, o = self.x[node], self.o[node]
+            o_to_move = self.player[node] == O
+            wins = self.geometry.wins
+            cells = bit_cells(self.geometry.full_mask ^ (x | o))
+            random.shuffle(cells)
+            result = 0
+            for cell in cells:
+                plies += 1
+                if o_to_move:
+                    o |= 1 << cell
+                    if wins(o, cell):
+                        result = 1
+                        break
+                else:
+                    x |= 1 << cell
+                    if wins(x, cell):
+                        result = -1
+                        break
+                o_to_move = not o_to_move
+        if profile is not None:
+            profile.hist("rollout_lengths", plies)
+        return result
+
+    def simulate_batch(self, node):
+        # Sum of self.rollouts playout results from node, in one NumPy call.
+        from .rollout import batch_rollouts
+
+        self.rollout_count += self.rollouts
+        if profile is not None:
+            profile.count("batched_rollouts", self.rollouts)
+        winner = self.winner[node]
+        x, o = self.x[node], self.o[node]
+        if winner != -1 or not self.geometry.full_mask ^ (x | o):
+            if profile is not None:
+                profile.hist("rollout_lengths", 0, self.rollouts)
+            return 0 if winner == -1 else self.rollouts if winner == O else -self.rollouts
+        results, lengths = batch_rollouts(x, o, self.player[node] == O, self.rollouts, self.rng, self.geometry)
+        if profile is not None:
+            for plies, games in Counter(lengths.tolist()).items():
+                profile.hist("rollout_lengths", plies, games)
+        return int(results.sum())
+
+    def backpropagate(self, node, result, count=1):
+        # Results are +1 for an O win and -1 for an X win, summed over count
+        # playouts. Each node scores them for the player who moved into it,
+        # which is the opponent of the player to move there.
+        visits = self.visits
+        wins = self.wins
+        player = self.player
+        parent = self.parent
+        while node != -1:
+            visits[node] += count
+            wins[node] += result if player[node] == X else -result
+            node = parent[node]
+
+    def search(self, iterations, deadline=None):
+        # With a deadline the iteration count is ignored and the search runs
+        # until the deadline passes, but always at least one iteration.
+        untried = self.untried
+        first_child = self.first_child
+        for i in (range(iterations) if deadline is None else count()):
+            if deadline is not None and i and perf_counter() >= deadline:
+                break
+            node = 0
+            while not untried[node] and first_child[node] != -1:
+                node = self.select_child(node)
+            if untried[node]:
+                node = self.expand(node)
+            if self.rollouts > 1:
+                self.backpropagate(node, self.simulate_batch(node), self.rollouts)
+            else:
+                self.backpropagate(node, self.simulate(node))
+
+    def children(self, node=0):
+        child = self.first_child[node]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def best_child(self, node=0):
+        return max(self.children(node), key=lambda child: self.visits[child])
+
+    def find(self, x, o):
+        # Follows the children consistent with the position (x, o) down from
+        # the root, returning the node for it or -1 if it was never expanded.
+        node = 0
+        if self.x[node] & ~x or self.o[node] & ~o:
+            return -1
+        while self.x[node] != x or self.o[node] != o:
+            for child in self.children(node):
+                if not (self.x[child] & ~x or self.o[child] & ~o):
+                    node = child
+                    break
+            else:
+                return -1
+        return node
+
+    def reroot(self, node):
+        # Makes node the new root and compacts its subtree to the front of
+        # the arrays; everything outside it, including its siblings, is freed.
+        if node == 0:
+            return
+        order = [node]
+        for kept in order:
+            order.extend(self.children(kept))
+        index = {old: new for new, old in enumerate(order)}
+
+        for column in self.columns():
+            values = [column[old] for old in order]
+            if column is self.parent or column is self.first_child or column is self.next_sibling:
+                values = [index.get(value, -1) for value in values]
+            del column[:]
+            column.extend(values)
+        self.size = self.capacity = len(order)
+
+
+class MCTSPlayer:
+    # Keeps one tree for a whole game. Before searching it moves the root
+    # down to the current position, so the visits already gathered for the
+    # line actually played carry over to the next move.
+    def __init__(self, iterations=1000, player=None, budget=None, rollouts=1, geometry=STANDARD):
+        self.iterations = iterations
+        self.player = player
+        self.budget = budget
+        self.rollouts = rollouts
+        self.geometry = geometry
+        self.tree = None
+
+    def reset(self):
+        self.tree = None
+
+    def move(self, board):
+        deadline = None if self.budget is None else perf_counter() + self.budget
+        x, o = self.geometry.from_list(board)
+        node = -1 if self.tree is None else self.tree.find(x, o)
+        if node == -1:
+            player = self.player or player_to_move(board)
+            self.tree = MCTSTree(
+                x, o, O if player == "O" else X, self.iterations + 1, self.rollouts, self.geometry,
+            )
+        else:
+            self.tree.reroot(node)
+            self.tree.grow(self.tree.size + self.iterations)
+        self.tree.search(self.iterations, deadline)
+        child = self.tree.best_child()
+        self.tree.reroot(child)
+        return self.tree.move[0]
+
+
+def player_to_move(board):
+    return "X" if board.count("X") == board.count("O") else "O"
+
+
+def build_tree(board, iterations, player=None, budget=None, rollouts=1, geometry=STANDARD):
+    deadline = None if budget is None else perf_counter() + budget
+    x, o = geometry.from_list(board)
+    if player is None:
+        player = player_to_move(board)
+    tree = MCTSTree(x, o, O if player == "O" else X, iterations + 1, rollouts, geometry)
+    tree.search(iterations, deadline)
+    return tree
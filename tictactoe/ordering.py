@@ -0,0 +1,60 @@
+from .geometry import STANDARD
+
+# Priority bands, above any history score.
+WIN = 1 << 40
+PV = 1 << 39
+BLOCK = 1 << 38
+KILLER = 1 << 37
+
+KILLERS_PER_PLY = 2
+
+
+class MoveOrdering:
+    # Orders moves for one alphabeta search: immediate wins, the best move
+    # found for the position by an earlier iteration, forced blocks, killer
+    # moves that cut off at the same ply, then moves by history score, with
+    # ties in static order. Reuse one instance across the iterations of an
+    # iterative deepening search so each round starts from the last one's
+    # principal variation. The same ordering works on any geometry; on
+    # large boards it is what makes a depth-limited search find anything.
+    def __init__(self, geometry=STANDARD):
+        self.geometry = geometry
+        self.killers = []
+        self.history = [0] * geometry.cells
+        self.pv = {}
+
+    def order(self, x, o, o_to_move, depth):
+        geometry = self.geometry
+        mover, opponent = (o, x) if o_to_move else (x, o)
+        killers = self.killers[depth] if 0 <= depth < len(self.killers) else ()
+        pv = self.pv.get((x, o))
+        history = self.history
+        wins = geometry.wins
+        moves = geometry.candidates(x, o)
+
+        def priority(i):
+            bit = 1 << i
+            if wins(mover | bit, i):
+                return WIN
+            if i == pv:
+                return PV
+            if wins(opponent | bit, i):
+                return BLOCK
+            if i in killers:
+                return KILLER
+            return history[i]
+
+        # sorted is stable, so equal priorities keep their static order.
+        return sorted(moves, key=priority, reverse=True)
+
+    def cutoff(self, move, depth, remaining):
+        while len(self.killers) <= depth:
+            self.killers.append([])
+        killers = self.killers[depth]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLERS_PER_PLY:]
+        self.history[move] += remaining * remaining
+
+    def best(self, x, o, move):
+        self.pv[(x, o)] = move
@@ -0,0 +1,161 @@
+import random
+
+from .board import EMPTY, display_board
+from .geometry import STANDARD
+from .mcts import MCTSPlayer
+from .qlearning import greedy_move, load_q_table, state_to_key
+from .quantum import quantum_random_move
+from .search import alphabeta_move, minimax_move
+from .state import MARKS, GameState
+from .transposition import TranspositionTable
+
+# A player is any object with reset(), called before each game, and
+# move(board), which returns the index of the cell it plays. Players are
+# built once per match and keep whatever they have learned or cached from
+# one move and one game to the next.
+
+
+def human_move(board):
+    last = len(board) - 1
+    while True:
+        try:
+            move = int(input(f"Enter your move (0-{last}): "))
+            if move < 0 or move > last:
+                print(f"Invalid move. Please enter a number between 0 and {last}.")
+            elif board[move] != EMPTY:
+                print("Cell already occupied. Try again.")
+            else:
+                return move
+        except ValueError:
+            print(f"Invalid input. Please enter a number between 0 and {last}.")
+
+
+def random_move(available_moves):
+    return random.choice(available_moves)
+
+
+class HumanPlayer:
+    def reset(self):
+        pass
+
+    def move(self, board):
+        return human_move(board)
+
+
+class SearchPlayer:
+    # Each search player has its own transposition table, kept between games.
+    # The opening book only covers 3x3, so it is ignored on other boards.
+    def __init__(self, search, budget=None, use_book=False, geometry=STANDARD):
+        self.search = search
+        self.budget = budget
+        self.use_book = use_book and geometry == STANDARD
+        self.geometry = geometry
+        self.table = TranspositionTable()
+
+    def reset(self):
+        pass
+
+    def move(self, board):
+        return self.search(board, self.table, self.use_book, self.budget, self.geometry)
+
+
+class QLearningPlayer:
+    # Plays greedily from a Q-table, exploring with probability epsilon. The
+    # (state, move) pairs of the current game are kept in trajectory so a
+    # caller can learn from them once the game is over.
+    def __init__(self, q_table, epsilon=0.1, explore=random_move):
+        self.q_table = q_table
+        self.epsilon = epsilon
+        self.explore = explore
+        self.trajectory = []
+
+    def reset(self):
+        self.trajectory = []
+
+    def move(self, board):
+        available_moves = [i for i, cell in enumerate(board) if cell == EMPTY]
+        state = state_to_key(board, self.q_table.geometry)
+        if random.random() < self.epsilon:
+            move = self.explore(available_moves)
+        else:
+            move = greedy_move(self.q_table, state, available_moves)
+        self.trajectory.append((state, move))
+        return move
+
+
+def _q_table(q_table, geometry):
+    return load_q_table(geometry=geometry) if q_table is None else q_table
+
+
+def _budget(budget, geometry):
+    # Exhaustive search is hopeless beyond 3x3, so searches there are timed.
+    return DEFAULT_BUDGET if budget is None and geometry != STANDARD else budget
+
+
+DEFAULT_BUDGET = 1.0
+
+# Factories take keyword options and ignore the ones they have no use for,
+# so callers can pass the same options to every player. geometry selects
+# the board; it defaults to 3x3.
+PLAYERS = {
+    "Human": lambda **options: HumanPlayer(),
+    "Minimax": lambda budget=None, use_book=False, geometry=STANDARD, **options: SearchPlayer(
+        minimax_move, _budget(budget, geometry), use_book, geometry,
+    ),
+    "AlphaBeta": lambda budget=None, use_book=False, geometry=STANDARD, **options: SearchPlayer(
+        alphabeta_move, _budget(budget, geometry), use_book, geometry,
+    ),
+    "MCTS": lambda budget=None, iterations=1000, rollouts=1, geometry=STANDARD, **options: MCTSPlayer(
+        iterations, budget=budget, rollouts=rollouts, geometry=geometry,
+    ),
+    "Reinforcement": lambda q_table=None, epsilon=0.1, geometry=STANDARD, **options: QLearningPlayer(
+        _q_table(q_table, geometry), epsilon,
+    ),
+    "Quantum": lambda q_table=None, epsilon=0.1, geometry=STANDARD, **options: QLearningPlayer(
+        _q_table(q_table, geometry), epsilon, quantum_random_move,
+    ),
+}
+
+
+def register(name, factory):
+    PLAYERS[name] = factory
+
+
+def make_player(name, **options):
+    try:
+        factory = PLAYERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown player: {name}") from None
+    return factory(**options)
+
+
+def play_game(player1, player2, observer=None, geometry=STANDARD):
+    # Plays one game with no output of its own; observer, if given, is called
+    # with the board after every move. player1 is X and moves first: every
+    # engine works out whose turn it is by counting stones, so the marks are
+    # fixed. Returns "Player 1", "Player 2" or "Draw".
+    board = geometry.initialize_board()
+    state = GameState(geometry)
+    players = (player1, player2)
+    for player in players:
+        player.reset()
+    turn = 0
+    while True:
+        move = players[turn].move(board)
+        board[move] = MARKS[turn]
+        state.play(move)
+        if observer is not None:
+            observer(board)
+        if state.winner is not None:
+            return "Player 2" if turn else "Player 1"
+        if state.is_full:
+            return "Draw"
+        turn ^= 1
+
+
+def play_human(computer, name="Computer", geometry=STANDARD):
+    # Interactive game: the human plays X and moves first.
+    display_board(geometry.initialize_board())
+    result = play_game(HumanPlayer(), computer, observer=display_board, geometry=geometry)
+    print({"Player 1": "You win!", "Player 2": f"{name} wins!", "Draw": "It's a draw!"}[result])
+    return result
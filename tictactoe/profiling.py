@@ -0,0 +1,65 @@
+from collections import Counter, defaultdict
+from importlib import import_module
+
+# Engine modules that report to a profile. Each has a module-level global
+# named profile that is None unless profiling is on, so a disabled hook
+# costs one global lookup and a comparison.
+HOOKED = ("search", "mcts", "quantum")
+
+
+def _export(counters, seconds, histograms):
+    return {
+        "counters": dict(counters),
+        "seconds": dict(seconds),
+        "histograms": {name: dict(values) for name, values in histograms.items()},
+    }
+
+
+class Profile:
+    # Counters, timers (in seconds) and histograms for the move in progress.
+    # end_move files them under that move and adds them to the game totals.
+    def __init__(self):
+        self.counters = Counter()
+        self.seconds = Counter()
+        self.histograms = defaultdict(Counter)
+        self.moves = []
+        self.total_counters = Counter()
+        self.total_seconds = Counter()
+        self.total_histograms = defaultdict(Counter)
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def time(self, name, seconds):
+        self.seconds[name] += seconds
+
+    def hist(self, name, key, amount=1):
+        self.histograms[name][key] += amount
+
+    def end_move(self, **details):
+        record = _export(self.counters, self.seconds, self.histograms)
+        record.update(details)
+        self.moves.append(record)
+        self.total_counters.update(self.counters)
+        self.total_seconds.update(self.seconds)
+        for name, values in self.histograms.items():
+            self.total_histograms[name].update(values)
+        self.counters.clear()
+        self.seconds.clear()
+        self.histograms.clear()
+        return record
+
+    def export(self):
+        return {"moves": self.moves, "game": _export(self.total_counters, self.total_seconds, self.total_histograms)}
+
+
+def enable(profile=None):
+    profile = Profile() if profile is None else profile
+    for name in HOOKED:
+        import_module(f"{__package__}.{name}").profile = profile
+    return profile
+
+
+def disable():
+    for name in HOOKED:
+        import_module(f"{__package__}.{name}").profile = None
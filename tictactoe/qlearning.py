@@ -0,0 +1,143 @@
+import os
+import pickle
+import random
+
+import numpy as np
+
+from .board import from_list
+from .geometry import STANDARD
+from .qtable import ACTIONS, LEGAL, PersistentQTable, QTable, SparseQTable, state_index, write_atomic
+from .symmetry import canonicalize, to_canonical_move
+
+
+# A state is the dense-table index of the canonical board plus the transform
+# that produced it. Q-values are stored against canonical actions, so all
+# eight symmetric versions of a position share one row. On other boards the
+# index is the geometry's canonical key into a SparseQTable.
+def state_to_key(board, geometry=STANDARD):
+    if geometry != STANDARD:
+        return state_from_masks(*geometry.from_list(board), geometry)
+    return state_from_masks(*from_list(board))
+
+
+def state_from_masks(x, o, geometry=STANDARD):
+    if geometry != STANDARD:
+        cx, co, transform = geometry.canonicalize(x, o)
+        return cx | co << geometry.cells, transform
+    cx, co, transform = canonicalize(x, o)
+    return state_index(cx, co), transform
+
+
+def get_q_values(q_table, state, moves):
+    index, transform = state
+    transform = q_table.transforms[transform]
+    return q_table.values[index, [transform[move] for move in moves]].tolist()
+
+
+def greedy_move(q_table, state, available_moves):
+    q_values = get_q_values(q_table, state, available_moves)
+    max_q = max(q_values)
+    best_moves = [move for move, q in zip(available_moves, q_values) if q == max_q]
+    return random.choice(best_moves)
+
+
+def backup_episode(q_table, trajectory, reward, alpha=0.1, gamma=0.9, lam=0.8):
+    # Credits a whole game at once. trajectory lists one side's (state,
+    # action) pairs in play order and reward is that side's final result.
+    # Walking backwards, each pair moves toward its lambda-return: the next
+    # state's greedy value and the return already carried through it, mixed
+    # by lam, so every move in the game learns from the final result.
+    values = q_table.values
+    target = reward
+    for state, action in reversed(trajectory):
+        index, transform = state
+        action = q_table.transforms[transform][action]
+        old_value = values[index, action]
+        q_table.set(index, action, old_value + alpha * (target - old_value))
+        next_max = values[index, q_table.legal(index)].max()
+        target = gamma * ((1 - lam) * next_max + lam * target)
+
+
+def trajectory_transitions(trajectory, reward):
+    # One-step transitions (state index, canonical action, reward, next state
+    # index) for one side's trajectory; the last one has next state -1.
+    transitions = []
+    for step, (state, action) in enumerate(trajectory):
+        index, transform = state
+        last = step == len(trajectory) - 1
+        transitions.append((
+            index,
+            to_canonical_move(action, transform),
+            reward if last else 0,
+            -1 if last else trajectory[step + 1][0][0],
+        ))
+    return transitions
+
+
+def batch_update(q_table, states, actions, rewards, next_states, alpha=0.1, gamma=0.9):
+    # Dense 3x3 tables only. Applies a batch of one-step Q-learning transitions in one NumPy pass.
+    # Every target is computed from the table as it was before the batch,
+    # and transitions that share a (state, action) entry move it by their
+    # mean TD error, so repeated positions do not multiply the step size.
+    # A next state of -1 is terminal.
+    states = np.asarray(states, dtype=np.intp)
+    actions = np.asarray(actions, dtype=np.intp)
+    rewards = np.asarray(rewards, dtype=np.float32)
+    next_states = np.asarray(next_states, dtype=np.intp)
+    values = q_table.values
+
+    terminal = next_states < 0
+    following = np.where(terminal, 0, next_states)
+    legal = LEGAL[following]
+    next_max = np.where(legal, values[following], -np.inf).max(axis=1)
+    next_max[terminal | ~legal.any(axis=1)] = 0
+    td = rewards + gamma * next_max - values[states, actions]
+
+    entries, inverse = np.unique(states * ACTIONS + actions, return_inverse=True)
+    mean_td = np.bincount(inverse.ravel(), weights=td) / np.bincount(inverse.ravel())
+    rows, columns = entries // ACTIONS, entries % ACTIONS
+    q_table.set_many(rows, columns, values[rows, columns] + alpha * mean_td)
+
+
+def from_legacy_dict(legacy):
+    # Pickled tables map (board string, action) to a value; symmetric
+    # entries that land on the same canonical entry are averaged.
+    merged = {}
+    for (key, action), value in legacy.items():
+        index, transform = state_to_key(list(key))
+        merged.setdefault((index, to_canonical_move(action, transform)), []).append(value)
+    q_table = QTable()
+    for (index, action), values in merged.items():
+        q_table.values[index, action] = sum(values) / len(values)
+    return q_table
+
+
+def q_table_filename(geometry=STANDARD):
+    # Other boards keep a sparse table in a pickle named after the board.
+    if geometry != STANDARD:
+        return f"q_table_{geometry.size}x{geometry.size}k{geometry.k}.pkl"
+    return "q_table.npy"
+
+
+def load_q_table(filename=None, geometry=STANDARD):
+    if filename is None:
+        filename = q_table_filename(geometry)
+    if geometry != STANDARD:
+        return SparseQTable.load(filename) if os.path.exists(filename) else SparseQTable(geometry)
+    if os.path.exists(filename):
+        return QTable.load(filename)
+    legacy = os.path.splitext(filename)[0] + ".pkl"
+    if os.path.exists(legacy):
+        with open(legacy, "rb") as f:
+            return from_legacy_dict(pickle.load(f))
+    return QTable()
+
+
+def save_q_table(q_table, filename=None):
+    q_table.save(q_table_filename(q_table.geometry) if filename is None else filename)
+
+
+def open_q_table(filename="q_table.npy", flush_every=256, flush_interval=30.0):
+    if not os.path.exists(filename):
+        write_atomic(filename, load_q_table(filename).values)
+    return PersistentQTable(filename, flush_every, flush_interval)
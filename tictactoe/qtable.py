@@ -0,0 +1,225 @@
+import os
+import pickle
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .board import BITS, FULL_MASK
+from .geometry import STANDARD, get_geometry
+from .symmetry import TRANSFORMS
+
+STATES = 3 ** 9
+ACTIONS = 9
+
+# A board is a 9-digit base-3 number (0 empty, 1 X, 2 O), which indexes
+# every position without collisions. The per-mask digit sums make that a
+# pair of lookups on the bitboard masks.
+X_INDEX = tuple(sum(3 ** i for i in range(9) if mask & BITS[i]) for mask in range(FULL_MASK + 1))
+O_INDEX = tuple(2 * index for index in X_INDEX)
+
+# LEGAL[state] marks the empty cells of that position.
+LEGAL = (np.arange(STATES)[:, None] // 3 ** np.arange(ACTIONS)) % 3 == 0
+
+JOURNAL_RECORD = np.dtype([("index", "<u4"), ("action", "u1"), ("value", "<f4")])
+JOURNAL_HEADER = struct.Struct("<II")
+
+
+def state_index(x, o):
+    return X_INDEX[x] + O_INDEX[o]
+
+
+def _fsync_directory(path):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def write_atomic(filename, values):
+    tmp = filename + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, values)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filename)
+    _fsync_directory(filename)
+
+
+class QTable:
+    geometry = STANDARD
+    transforms = TRANSFORMS
+
+    def __init__(self, values=None):
+        if values is None:
+            values = np.zeros((STATES, ACTIONS), dtype=np.float32)
+        self.values = values
+
+    def legal(self, index):
+        return LEGAL[index]
+
+    def set(self, index, action, value):
+        self.values[index, action] = value
+
+    def set_many(self, indices, actions, values):
+        self.values[indices, actions] = values
+
+    def save(self, filename):
+        write_atomic(filename, self.values)
+
+    @classmethod
+    def load(cls, filename):
+        values = np.load(filename)
+        if values.shape != (STATES, ACTIONS):
+            raise ValueError(f"{filename} holds a {values.shape} array, expected {(STATES, ACTIONS)}")
+        return cls(values.astype(np.float32, copy=False))
+
+
+class PersistentQTable(QTable):
+    # Reads and writes go to an in-memory copy; changed entries are written
+    # back to a memory map of the .npy file in batches. Each batch is first
+    # appended to a checksummed journal and fsynced, then applied to the
+    # map, and the journal is emptied once the map is synced. A crash at any
+    # point leaves either the old entries or a complete journal batch that
+    # is replayed the next time the table is opened.
+    def __init__(self, filename, flush_every=256, flush_interval=30.0):
+        self.filename = filename
+        self.journal = filename + ".journal"
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.mapped = np.load(filename, mmap_mode="r+")
+        if self.mapped.shape != (STATES, ACTIONS) or self.mapped.dtype != np.float32:
+            raise ValueError(f"{filename} does not hold a ({STATES}, {ACTIONS}) float32 table")
+        self.replay_journal()
+        super().__init__(np.array(self.mapped))
+        self.dirty = {}
+        self.last_flush = time.monotonic()
+
+    def set(self, index, action, value):
+        self.values[index, action] = value
+        self.dirty[(index, action)] = value
+        self.maybe_flush()
+
+    def set_many(self, indices, actions, values):
+        self.values[indices, actions] = values
+        self.dirty.update(zip(zip(np.asarray(indices).tolist(), np.asarray(actions).tolist()), np.asarray(values).tolist()))
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        if len(self.dirty) >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if not self.dirty:
+            return
+        records = np.array(
+            [(index, action, value) for (index, action), value in self.dirty.items()], dtype=JOURNAL_RECORD,
+        )
+        payload = records.tobytes()
+        with open(self.journal, "ab") as f:
+            f.write(JOURNAL_HEADER.pack(len(records), zlib.crc32(payload)))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self.apply(records)
+        self.dirty.clear()
+
+    def apply(self, records):
+        self.mapped[records["index"], records["action"]] = records["value"]
+        self.mapped.flush()
+        with open(self.journal, "r+b") as f:
+            f.truncate(0)
+            os.fsync(f.fileno())
+
+    def replay_journal(self):
+        if not os.path.exists(self.journal):
+            return
+        with open(self.journal, "rb") as f:
+            data = f.read()
+        batches = []
+        offset = 0
+        while offset + JOURNAL_HEADER.size <= len(data):
+            count, checksum = JOURNAL_HEADER.unpack_from(data, offset)
+            start = offset + JOURNAL_HEADER.size
+            payload = data[start:start + count * JOURNAL_RECORD.itemsize]
+            # A short or corrupt batch was cut off mid-write and never applied.
+            if len(payload) != count * JOURNAL_RECORD.itemsize or zlib.crc32(payload) != checksum:
+                break
+            batches.append(np.frombuffer(payload, dtype=JOURNAL_RECORD))
+            offset = start + len(payload)
+        if batches:
+            self.apply(np.concatenate(batches))
+        else:
+            os.remove(self.journal)
+
+    def save(self, filename):
+        if os.path.abspath(filename) == os.path.abspath(self.filename):
+            self.flush()
+        else:
+            super().save(filename)
+
+    def close(self):
+        self.flush()
+        del self.mapped
+
+
+class SparseValues:
+    # The rows of a SparseQTable, indexed like the dense array with
+    # [index, actions]. Reading a missing row gives zeros without storing it.
+    def __init__(self, cells, rows=None):
+        self.cells = cells
+        self.rows = {} if rows is None else rows
+
+    def __getitem__(self, key):
+        index, actions = key
+        row = self.rows.get(index)
+        if row is None:
+            row = np.zeros(self.cells, dtype=np.float32)
+        return row[actions]
+
+    def __setitem__(self, key, value):
+        index, actions = key
+        row = self.rows.get(index)
+        if row is None:
+            row = self.rows[index] = np.zeros(self.cells, dtype=np.float32)
+        row[actions] = value
+
+
+class SparseQTable:
+    # Q-table for boards too big to index densely. A state is the canonical
+    # key from Geometry.canonicalize (x | o << cells), and a row exists only
+    # once one of its entries has been written.
+    def __init__(self, geometry, rows=None):
+        self.geometry = geometry
+        self.transforms = geometry.transforms
+        self.values = SparseValues(geometry.cells, rows)
+
+    def legal(self, index):
+        occupied = (index | index >> self.geometry.cells) & self.geometry.full_mask
+        return np.array([not occupied >> i & 1 for i in range(self.geometry.cells)])
+
+    def set(self, index, action, value):
+        self.values[index, action] = value
+
+    def set_many(self, indices, actions, values):
+        for index, action, value in zip(indices, actions, values):
+            self.values[index, action] = value
+
+    def save(self, filename):
+        tmp = filename + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"size": self.geometry.size, "k": self.geometry.k, "rows": self.values.rows}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)
+        _fsync_directory(filename)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "rb") as f:
+            data = pickle.load(f)
+        return cls(get_geometry(data["size"], data["k"]), data["rows"])
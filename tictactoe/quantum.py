@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import deque
+
+# Bound on the registry of transpiled circuits.
+MAX_COMPILED = 1024
+# Width of the circuit behind the shared pool of random bits.
+POOL_QUBITS = 8
+
+# Qiskit takes seconds to import, so it is only loaded the first time a
+# quantum player needs a circuit.
+_backend = None
+_compiled = {}
+profile = None
+_lock = threading.Lock()
+stats = {
+    "transpile_calls": 0,
+    "transpile_seconds": 0.0,
+    "cache_hits": 0,
+    "execute_calls": 0,
+    "execute_seconds": 0.0,
+    "last_transpile_seconds": 0.0,
+    "last_execute_seconds": 0.0,
+}
+
+
+def _qiskit():
+    try:
+        import qiskit
+        from qiskit import Aer
+    except ImportError as error:
+        raise ImportError("the quantum players need qiskit and qiskit-aer (see requirements.txt)") from error
+    return qiskit, Aer
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _, Aer = _qiskit()
+        _backend = Aer.get_backend("qasm_simulator")
+    return _backend
+
+
+def circuit_key(circuit):
+    return (
+        circuit.num_qubits,
+        circuit.num_clbits,
+        tuple(
+            (
+                instruction.operation.name,
+                tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits),
+                tuple(circuit.find_bit(clbit).index for clbit in instruction.clbits),
+                repr(instruction.operation.params),
+            )
+            for instruction in circuit.data
+        ),
+    )
+
+
+def compile_circuit(circuit):
+    # Transpiled circuits are cached by structure, so building the same
+    # circuit again costs only the key.
+    key = circuit_key(circuit)
+    with _lock:
+        compiled = _compiled.get(key)
+        if compiled is not None:
+            stats["cache_hits"] += 1
+            stats["last_transpile_seconds"] = 0.0
+            return compiled
+    qiskit, _ = _qiskit()
+    start = time.perf_counter()
+    compiled = qiskit.transpile(circuit, get_backend())
+    elapsed = time.perf_counter() - start
+    with _lock:
+        if len(_compiled) >= MAX_COMPILED:
+            _compiled.clear()
+        _compiled[key] = compiled
+        stats["transpile_calls"] += 1
+        stats["transpile_seconds"] += elapsed
+        stats["last_transpile_seconds"] = elapsed
+    if profile is not None:
+        profile.count("transpiles")
+        profile.time("qiskit_transpile", elapsed)
+    return compiled
+
+
+def run_circuit(circuit, shots=1024, memory=False):
+    compiled = compile_circuit(circuit)
+    start = time.perf_counter()
+    result = get_backend().run(compiled, shots=shots, memory=memory).result()
+    elapsed = time.perf_counter() - start
+    with _lock:
+        stats["execute_calls"] += 1
+        stats["execute_seconds"] += elapsed
+        stats["last_execute_seconds"] = elapsed
+    if profile is not None:
+        profile.count("simulator_calls")
+        profile.time("qiskit_execute", elapsed)
+    return compiled, result
+
+
+def bit_circuit(qubits=POOL_QUBITS):
+    # A Hadamard on every qubit, so each shot measures qubits fair bits.
+    qiskit, _ = _qiskit()
+    circuit = qiskit.QuantumCircuit(qubits, qubits)
+    circuit.h(range(qubits))
+    circuit.measure(range(qubits), range(qubits))
+    return circuit
+
+
+class EntropyPool:
+    # Buffers random bits measured from one circuit. When the buffer drops
+    # below refill_at bits, a background thread runs the next batch. The
+    # first batch is small and each one after it doubles, up to max_shots,
+    # so a short run leaves few measured bits unused.
+    def __init__(self, circuit, shots=16, max_shots=1024, refill_at=64):
+        self.circuit = circuit
+        self.shots = shots
+        self.max_shots = max_shots
+        self.refill_at = refill_at
+        self.buffer = deque()
+        self.lock = threading.Lock()
+        self.refill = None
+
+    def run(self):
+        shots = self.shots
+        self.shots = min(shots * 2, self.max_shots)
+        compiled, result = run_circuit(self.circuit, shots, memory=True)
+        self.buffer.extend(bit == "1" for bitstring in result.get_memory(compiled) for bit in bitstring)
+
+    def start_refill(self):
+        with self.lock:
+            if self.refill is None or not self.refill.is_alive():
+                self.refill = threading.Thread(target=self.run, daemon=True)
+                self.refill.start()
+            return self.refill
+
+    def bit(self):
+        if len(self.buffer) <= self.refill_at:
+            refill = self.start_refill()
+            if not self.buffer:
+                refill.join()
+                if not self.buffer:
+                    self.run()
+        return self.buffer.popleft()
+
+    def randbelow(self, n):
+        # Uniform on range(n): reads just enough bits for n - 1 and draws
+        # again when the value is n or more.
+        width = (n - 1).bit_length()
+        while True:
+            value = 0
+            for _ in range(width):
+                value = value << 1 | self.bit()
+            if value < n:
+                return value
+
+
+# Every uniform draw shares one pool, so one circuit is compiled.
+_pool = None
+
+
+def get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = EntropyPool(bit_circuit())
+        return _pool
+
+
+def quantum_random_move(available_moves):
+    # Uniform over the legal moves, drawn from the shared pool of measured
+    # bits, so every bit measured is used and no draw falls back.
+    if profile is not None:
+        profile.count("quantum_samples")
+    return available_moves[get_pool().randbelow(len(available_moves))]
@@ -0,0 +1,54 @@
+import numpy as np
+
+from .geometry import STANDARD, bit_cells
+
+
+class LineIndex:
+    # Column j of matrix marks the cells of win line j, so a (games, cells)
+    # ownership matrix times it counts a player's stones on every line.
+    def __init__(self, geometry):
+        self.cells = geometry.cells
+        self.k = geometry.k
+        self.matrix = np.zeros((geometry.cells, len(geometry.lines)), dtype=np.float32)
+        for j, line in enumerate(geometry.lines):
+            self.matrix[list(line), j] = 1
+        self.line_cells = np.array(geometry.lines)
+
+
+_indexes = {}
+
+
+def line_index(geometry):
+    index = _indexes.get(geometry)
+    if index is None:
+        index = _indexes[geometry] = LineIndex(geometry)
+    return index
+
+
+def batch_rollouts(x, o, o_to_move, count, rng=None, geometry=STANDARD):
+    # Plays count uniformly random games on from a non-terminal position.
+    # Returns two arrays: +1 for each O win, -1 for each X win and 0 for each
+    # draw, and how many plies each game lasted.
+    #
+    # A random playout fills the empty cells in a random order, so each game
+    # is drawn as a random permutation of the empty cells. Played out to a
+    # full board, a line wins for the player who owns all of its cells, at
+    # the ply its last cell was filled; the game ends at the earliest such ply.
+    if rng is None:
+        rng = np.random.default_rng()
+    index = line_index(geometry)
+    cells = index.cells
+    empty = np.array(bit_cells(geometry.full_mask ^ (x | o)), dtype=np.intp)
+
+    plies = np.full((count, cells), -1, dtype=np.int16)
+    plies[:, empty] = rng.permuted(np.broadcast_to(np.arange(len(empty), dtype=np.int16), (count, len(empty))), axis=1)
+    owned_by_o = np.zeros((count, cells), dtype=bool)
+    owned_by_o[:, bit_cells(o)] = True
+    owned_by_o[:, empty] = (plies[:, empty] % 2 == 0) == o_to_move
+
+    o_count = owned_by_o.astype(np.float32) @ index.matrix
+    completed = plies[:, index.line_cells].max(axis=2)
+    never = np.int16(len(empty))
+    o_first = np.where(o_count == index.k, completed, never).min(axis=1)
+    x_first = np.where(o_count == 0, completed, never).min(axis=1)
+    return np.sign(x_first - o_first).astype(np.int8), np.minimum(np.minimum(x_first, o_first) + 1, never)
@@ -0,0 +1,259 @@
+from time import perf_counter
+
+from .board import EMPTY
+from .geometry import STANDARD
+from .ordering import MoveOrdering
+from .state import O, GameState
+from .transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+# Shared by every search in the process, so positions solved for one move
+# or one game are reused by the next.
+TABLE = TranspositionTable()
+# Other boards get one table each, made on first use.
+_tables = {STANDARD: TABLE}
+
+# Half-width of the window each iterative deepening round first tries
+# around the previous round's score.
+ASPIRATION = 2
+
+profile = None
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def book_move(board):
+    from .book import get_book
+
+    book = get_book()
+    if book is None:
+        return None
+    move = book.best_move(board)
+    # Anything the book cannot answer with a legal move goes to the search.
+    if move is None or board[move] != EMPTY:
+        return None
+    return move
+
+
+# A single negamax search serves every board and both sides. Scores are
+# from the side to move: a move that wins scores win_score(geometry), and
+# each ply a result is carried back up costs it a point, so a quicker win
+# (or a slower loss) scores higher. Positions at max_depth, and drawn ones,
+# score 0. Scores are relative to the node, not the root, so a table entry
+# holds for the position wherever it comes up.
+#
+# Table entries record how many plies below them were searched (their
+# draft) and are only reused by searches that need no more than that.
+def win_score(geometry):
+    # Wins never carry back to below 2, so no win is mistaken for a draw.
+    return geometry.cells + 2
+
+
+def _carry(score):
+    # A child's score as seen from its parent.
+    if score > 0:
+        return 1 - score
+    if score < 0:
+        return -1 - score
+    return 0
+
+
+def _window(bound):
+    # The child score that carries back to exactly bound: _carry's inverse.
+    if bound > 0:
+        return -bound - 1
+    if bound < 0:
+        return 1 - bound
+    return 0
+
+
+def negamax(state, depth, alpha, beta, table, max_depth, deadline=None, ordering=None, prune=True):
+    # Value of a position whose last move did not end the game. Without
+    # prune it is a plain minimax: the window is never narrowed, so nothing
+    # is cut and every value is exact.
+    if profile is not None:
+        profile.count("terminal_checks")
+    cells = state.geometry.cells
+    if state.stones == cells or depth >= max_depth:
+        return 0
+    if deadline is not None and perf_counter() > deadline:
+        raise SearchTimeout
+
+    draft = min(max_depth - depth, cells - state.stones)
+    x, o = state.masks
+    key = state.geometry.position_key(x, o, state.turn)
+    entry = table.get(key)
+    if entry is not None and entry[2] >= draft:
+        value, flag = entry[0], entry[1]
+        if flag == EXACT:
+            return value
+        # Bounds left by a pruning search sharing the table are no use to
+        # one that needs exact values.
+        if prune:
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+    alpha_orig, beta_orig = alpha, beta
+    if profile is not None:
+        profile.count("nodes")
+    moves = state.moves() if ordering is None else ordering.order(x, o, state.turn == O, depth)
+
+    # Children that are won, full or at the depth limit are scored here
+    # rather than by a call.
+    win = win_score(state.geometry)
+    leaf = depth + 1 >= max_depth or state.stones + 1 == cells
+    child_alpha, child_beta = _window(beta), _window(alpha)
+    best_move = moves[0]
+    best_score = -float("inf")
+    for i in moves:
+        state.play(i)
+        if state.winner is not None:
+            score = win
+        elif leaf:
+            score = 0
+        else:
+            # _carry, written out.
+            score = -negamax(state, depth + 1, child_alpha, child_beta, table, max_depth, deadline, ordering, prune)
+            if score > 0:
+                score -= 1
+            elif score < 0:
+                score += 1
+        state.undo()
+        if score > best_score:
+            best_score = score
+            best_move = i
+            if prune and score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    table.cutoffs += 1
+                    if profile is not None:
+                        profile.hist("cutoffs_by_ply", depth + 1)
+                    if ordering is not None:
+                        ordering.cutoff(i, depth, max_depth - depth)
+                    break
+                child_beta = _window(alpha)
+
+    if best_score <= alpha_orig:
+        table.store(key, best_score, UPPER, draft)
+    else:
+        if ordering is not None:
+            ordering.best(x, o, best_move)
+        if best_score >= beta_orig:
+            table.store(key, best_score, LOWER, draft)
+        else:
+            table.store(key, best_score, EXACT, draft)
+    return best_score
+
+
+def negamax_root(state, table, max_depth, alpha=-float("inf"), beta=float("inf"), deadline=None, ordering=None,
+                 prune=True):
+    # (score, move) for the side to move. Moves are searched max_depth
+    # plies below the root. A score at or outside the window is only a
+    # bound, and the move that produced it need not be the best.
+    x, o = state.masks
+    moves = state.moves() if ordering is None else ordering.order(x, o, state.turn == O, -1)
+    win = win_score(state.geometry)
+    best_move = None
+    best_score = -float("inf")
+    for i in moves:
+        state.play(i)
+        if state.winner is not None:
+            score = win
+        else:
+            score = _carry(negamax(state, 0, _window(beta), _window(alpha), table, max_depth, deadline,
+                                   ordering, prune))
+        state.undo()
+        if best_move is None or score > best_score:
+            best_score = score
+            best_move = i
+            if prune and score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+    if ordering is not None and best_move is not None:
+        ordering.best(x, o, best_move)
+    return best_score, best_move
+
+
+def move_scores(state, table):
+    # Exact (score, move) for every move, from a full-depth search.
+    win = win_score(state.geometry)
+    max_depth = state.geometry.cells - state.stones
+    scores = []
+    for i in state.moves():
+        state.play(i)
+        if state.winner is not None:
+            scores.append((win, i))
+        else:
+            scores.append((_carry(negamax(state, 0, -float("inf"), float("inf"), table, max_depth)), i))
+        state.undo()
+    return scores
+
+
+def deepen(state, table, deadline=None, ordering=None, prune=True, max_depth=None):
+    # Iterative deepening as a generator: yields (depth, score, move) as
+    # each round finishes, one ply deeper than the last, so a caller can
+    # stop whenever it has an answer it likes. After the first round each
+    # is searched in a window around the previous score, and again with a
+    # full window only if the score falls outside it. Rounds stop once the
+    # score is a win or a loss, which no deeper search can change, or at
+    # the deadline, when the state is put back as it was.
+    remaining = state.geometry.cells - state.stones
+    limit = remaining if max_depth is None else min(max_depth, remaining)
+    played = len(state.history)
+    score = None
+    try:
+        for depth in range(limit):
+            if score is None or not prune:
+                score, move = negamax_root(state, table, depth, deadline=deadline, ordering=ordering, prune=prune)
+            else:
+                alpha, beta = score - ASPIRATION, score + ASPIRATION
+                score, move = negamax_root(state, table, depth, alpha, beta, deadline, ordering)
+                if score <= alpha or score >= beta:
+                    score, move = negamax_root(state, table, depth, deadline=deadline, ordering=ordering)
+            yield depth, score, move
+            if score:
+                return
+    except SearchTimeout:
+        while len(state.history) > played:
+            state.undo()
+
+
+def iterative_deepening(state, table, budget, ordering=None, prune=True):
+    # Answers with the move from the deepest round that finished within
+    # the budget (in seconds).
+    best_move = state.moves()[0]
+    for depth, score, move in deepen(state, table, perf_counter() + budget, ordering, prune):
+        best_move = move
+    return best_move
+
+
+def search_move(board, table=None, use_book=False, budget=None, geometry=STANDARD, prune=True):
+    # Moves for whichever side is to move. Without a budget the search runs
+    # to the end of the game, which is only practical on 3x3.
+    if use_book and geometry == STANDARD:
+        move = book_move(board)
+        if move is not None:
+            return move
+    state = GameState.from_board(board, geometry)
+    if table is None:
+        table = _tables.get(geometry)
+        if table is None:
+            table = _tables[geometry] = TranspositionTable()
+    # One ordering per move, shared by every round of the search.
+    ordering = MoveOrdering(geometry) if prune else None
+    if budget is not None:
+        return iterative_deepening(state, table, budget, ordering, prune)
+    return negamax_root(state, table, geometry.cells - state.stones, ordering=ordering, prune=prune)[1]
+
+
+def minimax_move(board, table=None, use_book=False, budget=None, geometry=STANDARD):
+    return search_move(board, table, use_book, budget, geometry, prune=False)
+
+
+def alphabeta_move(board, table=None, use_book=False, budget=None, geometry=STANDARD):
+    return search_move(board, table, use_book, budget, geometry)
@@ -0,0 +1,102 @@
+from .geometry import STANDARD, bit_cells
+
+X, O = 0, 1
+MARKS = ("X", "O")
+
+
+class GameState:
+    # A position on any geometry, changed in place by play(move) and undo().
+    # counts[player][n] is how many of that player's stones lie on line n.
+    # A move only updates the lines through its cell, and the game is won
+    # when one of them reaches k, so winner and is_over are read for free.
+    # Players are X (0) and O (1); X moves first.
+    def __init__(self, geometry=STANDARD):
+        self.geometry = geometry
+        self.k = geometry.k
+        self.cell_lines = geometry.cell_lines
+        self.masks = [0, 0]
+        self.counts = ([0] * len(geometry.lines), [0] * len(geometry.lines))
+        self.turn = X
+        self.stones = 0
+        self.winner = None
+        self.history = []
+
+    @classmethod
+    def from_masks(cls, x, o, geometry=STANDARD):
+        state = cls(geometry)
+        for player, mask in ((X, x), (O, o)):
+            for cell in bit_cells(mask):
+                if state._add(player, cell, 1) and state.winner is None:
+                    state.winner = player
+                state.stones += 1
+        state.turn = O if bin(x).count("1") > bin(o).count("1") else X
+        return state
+
+    @classmethod
+    def from_board(cls, board, geometry=STANDARD):
+        return cls.from_masks(*geometry.from_list(board), geometry)
+
+    def _add(self, player, cell, step):
+        # Adds (step 1) or removes (step -1) a stone; True if a line is full.
+        self.masks[player] ^= 1 << cell
+        counts = self.counts[player]
+        k = self.geometry.k
+        full = False
+        for line in self.geometry.cell_lines[cell]:
+            counts[line] += step
+            if counts[line] == k:
+                full = True
+        return full
+
+    # play and undo are _add written out, since the searches call them at
+    # every node. Moves are only played while the game is not over, so
+    # undoing one always leaves a position with no winner.
+    def play(self, move):
+        player = self.turn
+        self.history.append(move)
+        self.masks[player] |= 1 << move
+        counts = self.counts[player]
+        k = self.k
+        for line in self.cell_lines[move]:
+            count = counts[line] = counts[line] + 1
+            if count == k:
+                self.winner = player
+        self.stones += 1
+        self.turn = player ^ 1
+
+    def undo(self):
+        move = self.history.pop()
+        self.winner = None
+        player = self.turn = self.turn ^ 1
+        self.masks[player] ^= 1 << move
+        counts = self.counts[player]
+        for line in self.cell_lines[move]:
+            counts[line] -= 1
+        self.stones -= 1
+        return move
+
+    @property
+    def x(self):
+        return self.masks[X]
+
+    @property
+    def o(self):
+        return self.masks[O]
+
+    @property
+    def is_full(self):
+        return self.stones == self.geometry.cells
+
+    @property
+    def is_draw(self):
+        return self.winner is None and self.stones == self.geometry.cells
+
+    @property
+    def is_over(self):
+        return self.winner is not None or self.stones == self.geometry.cells
+
+    def moves(self):
+        return self.geometry.candidates(self.masks[X], self.masks[O])
+
+    def to_list(self):
+        return self.geometry.to_list(self.masks[X], self.masks[O])
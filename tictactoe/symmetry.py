@@ -0,0 +1,19 @@
+from .geometry import STANDARD
+
+# The 3x3 board's eight symmetries (the D4 group), from the standard
+# geometry. TRANSFORMS[t][i] is the cell that cell i lands on under
+# transform t; transform 0 is the identity.
+TRANSFORMS = STANDARD.transforms
+INVERSE_TRANSFORMS = STANDARD.inverse_transforms
+MASK_MAPS = STANDARD.mask_maps
+
+canonicalize = STANDARD.canonicalize
+canonical_index = STANDARD.canonical_index
+
+
+def to_canonical_move(move, transform):
+    return TRANSFORMS[transform][move]
+
+
+def from_canonical_mask(mask, transform):
+    return MASK_MAPS[INVERSE_TRANSFORMS[transform]][mask]
@@ -0,0 +1,232 @@
+import argparse
+import random
+import time
+from collections import Counter
+from functools import partial
+
+from .board import EMPTY, MOVES
+from .geometry import STANDARD, VARIANTS, bit_cells, get_variant
+from .mcts import MCTSPlayer
+from .qlearning import (
+    backup_episode, batch_update, greedy_move, load_q_table, q_table_filename, save_q_table, state_from_masks,
+    trajectory_transitions,
+)
+from .qtable import QTable, SparseQTable
+from .search import alphabeta_move, minimax_move
+
+OPPONENTS = ["self", "random", "minimax", "alphabeta", "mcts"]
+# Exhaustive search is hopeless beyond 3x3, so search opponents there are
+# timed, with this many seconds a move.
+SEARCH_BUDGET = 0.1
+
+
+# Schedules are partials of module-level functions so that they can be
+# pickled into actor processes.
+def _linear(start, end, episodes, episode):
+    return start + (end - start) * min(episode / max(episodes - 1, 1), 1.0)
+
+
+def _exponential(start, end, decay, episode):
+    return max(start * decay ** episode, end)
+
+
+def linear_schedule(start, end, episodes):
+    return partial(_linear, start, end, episodes)
+
+
+def exponential_schedule(start, end, episodes):
+    # Decays from start so that it reaches end on the last episode. A decay
+    # toward 0 never gets there, so both ends must be positive.
+    if start <= 0 or end <= 0:
+        raise ValueError(f"An exponential schedule needs positive start and end epsilons, got {start} and {end}")
+    decay = (end / start) ** (1 / max(episodes - 1, 1))
+    return partial(_exponential, start, end, decay)
+
+
+def make_opponent(name, mcts_iterations=200, geometry=STANDARD):
+    budget = None if geometry == STANDARD else SEARCH_BUDGET
+    if name == "self":
+        return None
+    if name == "random":
+        return lambda board: random.choice([i for i, cell in enumerate(board) if cell == EMPTY])
+    if name == "minimax":
+        return lambda board: minimax_move(board, use_book=True, budget=budget, geometry=geometry)
+    if name == "alphabeta":
+        return lambda board: alphabeta_move(board, use_book=True, budget=budget, geometry=geometry)
+    if name == "mcts":
+        return MCTSPlayer(iterations=mcts_iterations, geometry=geometry).move
+    raise ValueError(f"Unknown opponent: {name}")
+
+
+def play_episode(q_table, opponent, agent, epsilon, alpha=0.1, gamma=0.9, lam=0.8, buffer=None):
+    # Plays one game without any output on the table's board, then backs the
+    # result up through every move the learning side made. With no opponent
+    # both sides learn from the same table. Given a buffer, the one-step
+    # transitions are appended to it instead, for a later batch_update
+    # (dense 3x3 tables only). Returns "X", "O" or "Draw".
+    geometry = q_table.geometry
+    full_mask = geometry.full_mask
+    wins = geometry.wins
+    # 3x3 lists empty cells and keys states with table lookups.
+    if geometry == STANDARD:
+        empty_cells, state_key = MOVES.__getitem__, state_from_masks
+    else:
+        empty_cells, state_key = bit_cells, partial(state_from_masks, geometry=geometry)
+    board = geometry.initialize_board()
+    x = o = 0
+    player = "X"
+    trajectories = {"X": [], "O": []}
+    while True:
+        if opponent is None or player == agent:
+            state = state_key(x, o)
+            available_moves = empty_cells(full_mask ^ (x | o))
+            if random.random() < epsilon:
+                move = random.choice(available_moves)
+            else:
+                move = greedy_move(q_table, state, available_moves)
+            trajectories[player].append((state, move))
+        else:
+            move = opponent(board)
+
+        board[move] = player
+        if player == "X":
+            x |= 1 << move
+            mask = x
+        else:
+            o |= 1 << move
+            mask = o
+        if wins(mask, move):
+            winner = player
+            break
+        if x | o == full_mask:
+            winner = "Draw"
+            break
+        player = "O" if player == "X" else "X"
+
+    for side, trajectory in trajectories.items():
+        if trajectory:
+            reward = 0 if winner == "Draw" else 1 if winner == side else -1
+            if buffer is None:
+                backup_episode(q_table, trajectory, reward, alpha, gamma, lam)
+            else:
+                buffer.extend(trajectory_transitions(trajectory, reward))
+    return winner
+
+
+def apply_transitions(q_table, buffer, alpha=0.1, gamma=0.9):
+    if buffer:
+        batch_update(q_table, *zip(*buffer), alpha=alpha, gamma=gamma)
+        buffer.clear()
+
+
+def train(q_table, episodes, opponent="self", agent="X", schedule=None, alpha=0.1, gamma=0.9, lam=0.8,
+          checkpoint=None, checkpoint_every=0, log=None, mcts_iterations=200, batch_episodes=0):
+    # Trains on the board of q_table, which is a SparseQTable on any board
+    # but 3x3 and so can only take TD(lambda) backups.
+    if batch_episodes and q_table.geometry != STANDARD:
+        raise ValueError("Batched updates need a dense 3x3 table")
+    if schedule is None:
+        schedule = linear_schedule(1.0, 0.05, episodes)
+    # MCTS opponents keep a tree per game, so they are rebuilt every episode.
+    make_each_episode = opponent == "mcts"
+    policy = make_opponent(opponent, mcts_iterations, q_table.geometry)
+
+    # With batch_episodes set, experience is gathered as one-step transitions
+    # and applied with batch_update every batch_episodes games.
+    buffer = [] if batch_episodes else None
+
+    results = Counter()
+    start = time.perf_counter()
+    for episode in range(episodes):
+        if make_each_episode:
+            policy = make_opponent(opponent, mcts_iterations, q_table.geometry)
+        results[play_episode(q_table, policy, agent, schedule(episode), alpha, gamma, lam, buffer)] += 1
+        if buffer is not None and (episode + 1) % batch_episodes == 0:
+            apply_transitions(q_table, buffer, alpha, gamma)
+
+        if checkpoint_every and (episode + 1) % checkpoint_every == 0:
+            if checkpoint is not None:
+                save_q_table(q_table, checkpoint)
+            if log is not None:
+                elapsed = time.perf_counter() - start
+                log(f"{episode + 1} episodes, epsilon {schedule(episode):.3f}, "
+                    f"{(episode + 1) / elapsed:.0f} games/s, {dict(results)}")
+    if buffer is not None:
+        apply_transitions(q_table, buffer, alpha, gamma)
+    elapsed = time.perf_counter() - start
+    if checkpoint is not None:
+        save_q_table(q_table, checkpoint)
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a Q-table offline without printing any boards.")
+    parser.add_argument("--episodes", type=int, default=100000)
+    parser.add_argument("--variant", choices=list(VARIANTS), default="3x3")
+    parser.add_argument("--opponent", choices=OPPONENTS, default="self")
+    parser.add_argument("--agent", choices=["X", "O"], default="X", help="side that learns against a fixed opponent")
+    parser.add_argument("--schedule", choices=["linear", "exponential"], default="linear")
+    parser.add_argument("--epsilon-start", type=float, default=1.0)
+    parser.add_argument("--epsilon-end", type=float, default=0.05)
+    parser.add_argument("--alpha", type=float, default=0.1)
+    parser.add_argument("--gamma", type=float, default=0.9)
+    parser.add_argument("--lam", type=float, default=None,
+                        help="TD(lambda) trace decay for the episode backup (default 0.8); "
+                             "serial runs without --batch-episodes only")
+    parser.add_argument("--batch-episodes", type=int, default=None,
+                        help="apply one-step updates in batches of this many episodes instead of TD(lambda) "
+                             "(default: off, or 64 with --workers)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="actor processes; above 1, a central learner applies their batches of one-step updates")
+    parser.add_argument("--output", default=None, help="table to train (default: the variant's usual file)")
+    parser.add_argument("--checkpoint-every", type=int, default=10000)
+    parser.add_argument("--fresh", action="store_true", help="start from an empty table instead of --output")
+    parser.add_argument("--mcts-iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    # Parallel and batched runs learn from one-step transitions, so they have
+    # no use for lam, and parallel runs cannot work without batches.
+    if args.lam is not None and (args.workers > 1 or args.batch_episodes):
+        parser.error("--lam has no effect with --workers or --batch-episodes, which make one-step updates")
+    if args.workers > 1 and args.batch_episodes is not None and args.batch_episodes < 1:
+        parser.error("--batch-episodes must be positive with --workers")
+    geometry = get_variant(args.variant)
+    if geometry != STANDARD and (args.workers > 1 or args.batch_episodes):
+        parser.error("--workers and --batch-episodes need the dense 3x3 table; other variants train serially")
+    if args.output is None:
+        args.output = q_table_filename(geometry)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.fresh:
+        q_table = QTable() if geometry == STANDARD else SparseQTable(geometry)
+    else:
+        q_table = load_q_table(args.output, geometry)
+    make_schedule = linear_schedule if args.schedule == "linear" else exponential_schedule
+    try:
+        schedule = make_schedule(args.epsilon_start, args.epsilon_end, args.episodes)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.workers > 1:
+        from .actors import train_parallel
+        results, elapsed = train_parallel(
+            q_table, args.episodes, args.opponent, args.agent, schedule, args.alpha, args.gamma,
+            workers=args.workers, batch_episodes=args.batch_episodes or 64,
+            checkpoint=args.output, checkpoint_every=args.checkpoint_every, log=print,
+            mcts_iterations=args.mcts_iterations, seed=args.seed,
+        )
+    else:
+        results, elapsed = train(
+            q_table, args.episodes, args.opponent, args.agent, schedule, args.alpha, args.gamma,
+            0.8 if args.lam is None else args.lam,
+            checkpoint=args.output, checkpoint_every=args.checkpoint_every, log=print,
+            mcts_iterations=args.mcts_iterations, batch_episodes=args.batch_episodes or 0,
+        )
+    print(f"\nTrained {args.episodes} episodes in {elapsed:.1f}s ({args.episodes / elapsed:.0f} games/s)")
+    print(f"X wins: {results['X']}, O wins: {results['O']}, draws: {results['Draw']}")
+    print(f"Saved Q-table to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
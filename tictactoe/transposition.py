@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+from .geometry import STANDARD
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class TranspositionTable:
+    def __init__(self, max_entries=1 << 16):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Beta cutoffs taken by searches using this table.
+        self.cutoffs = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, key, value, flag, draft):
+        entries = self.entries
+        entries[key] = (value, flag, draft)
+        entries.move_to_end(key)
+        # Least recently used entries go first once the cap is reached.
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.cutoffs = 0
+
+
+# Symmetric 3x3 positions share a value, so they share one entry.
+position_key = STANDARD.position_key